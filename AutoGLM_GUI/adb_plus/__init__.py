@@ -4,7 +4,7 @@ from .keyboard_installer import ADBKeyboardInstaller
 from .screenshot import Screenshot, capture_screenshot
 from .touch import touch_down, touch_move, touch_up
 from .ip import get_wifi_ip
-from .serial import get_device_serial, extract_serial_from_mdns
+from .serial import get_device_serial, get_device_serials, extract_serial_from_mdns
 from .device import check_device_available
 from .pair import pair_device
 from .mdns import discover_mdns_devices, MdnsDevice
@@ -20,6 +20,7 @@ __all__ = [
     "touch_up",
     "get_wifi_ip",
     "get_device_serial",
+    "get_device_serials",
     "extract_serial_from_mdns",
     "check_device_available",
     "pair_device",
@@ -8,6 +8,8 @@ from typing import Optional
 
 __all__ = ["get_wifi_ip"]
 
+_IPV4_RE = re.compile(r"\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b")
+
 
 def _run(adb_path: str, device_id: Optional[str], cmd: list[str]) -> str:
     base_cmd = [adb_path]
@@ -20,7 +22,7 @@ def _run(adb_path: str, device_id: Optional[str], cmd: list[str]) -> str:
 
 
 def _extract_ip(text: str) -> Optional[str]:
-    m = re.search(r"\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b", text)
+    m = _IPV4_RE.search(text)
     if not m:
         return None
     ip = m.group(0)
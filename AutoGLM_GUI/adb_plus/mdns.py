@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import re
+import socket
 from typing import Optional
 from dataclasses import dataclass
 
@@ -11,7 +11,7 @@ from AutoGLM_GUI.platform_utils import run_cmd_silently_sync
 __all__ = ["MdnsDevice", "discover_mdns_devices"]
 
 
-@dataclass
+@dataclass(slots=True)
 class MdnsDevice:
     """Represents an mDNS-discovered ADB device."""
 
@@ -59,34 +59,22 @@ def _parse_address(address: str) -> tuple[str, int] | None:
     Returns:
         Tuple of (ip, port) or None if invalid or 0.0.0.0
     """
-    # Match IP:port pattern
-    match = re.match(r"^([\d.]+):(\d+)$", address)
-    if not match:
+    ip, sep, port_str = address.rpartition(":")
+    if not sep or not (port_str.isascii() and port_str.isdigit()):
         return None
 
-    ip = match.group(1)
-    port_str = match.group(2)
-
     # Skip 0.0.0.0 addresses (device not properly initialized)
     if ip == "0.0.0.0":
         return None
 
-    # Validate IP format
-    ip_pattern = r"^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$"
-    if not re.match(ip_pattern, ip):
-        return None
-
-    # Validate IP octets
-    octets = ip.split(".")
-    if not all(0 <= int(octet) <= 255 for octet in octets):
+    # Validate IP with the C-level parser (strict dotted quad, octets 0-255)
+    try:
+        socket.inet_pton(socket.AF_INET, ip)
+    except OSError:
         return None
 
-    # Parse port
-    try:
-        port = int(port_str)
-        if not (1 <= port <= 65535):
-            return None
-    except ValueError:
+    port = int(port_str)
+    if not (1 <= port <= 65535):
         return None
 
     return ip, port
@@ -25,8 +25,8 @@ def pair_device(
         >>> pair_device("192.168.1.100", 37831, "197872")
         (True, "Successfully paired to 192.168.1.100:37831")
     """
-    # Validate pairing code format (6 digits)
-    if not pairing_code.isdigit() or len(pairing_code) != 6:
+    # Validate pairing code format (6 digits); the O(1) length check goes first
+    if len(pairing_code) != 6 or not pairing_code.isdigit():
         return False, "Pairing code must be 6 digits"
 
     address = f"{ip}:{port}"
@@ -38,15 +38,16 @@ def pair_device(
         )
 
         output = result.stdout + result.stderr
+        lowered = output.lower()
 
         # Check for success indicators
-        if "Successfully paired" in output or "success" in output.lower():
+        if "success" in lowered:
             return True, f"Successfully paired to {address}"
-        elif "failed" in output.lower():
+        elif "failed" in lowered:
             # Extract error details
-            if "pairing code" in output.lower():
+            if "pairing code" in lowered:
                 return False, "Invalid pairing code"
-            elif "refused" in output.lower():
+            elif "refused" in lowered:
                 return (
                     False,
                     "Connection refused - check if wireless debugging is enabled",
@@ -1,7 +1,9 @@
 """Get device serial number using ADB."""
 
 import re
-from typing import Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Iterable, MutableMapping, Optional
 
 from AutoGLM_GUI.platform_utils import run_cmd_silently_sync
 
@@ -92,3 +94,73 @@ def get_device_serial(device_id: str, adb_path: str = "adb") -> str | None:
         logger.debug(f"Failed to get serial via getprop for {device_id}: {e}")
 
     return None
+
+
+def get_device_serials(
+    device_ids: Iterable[str],
+    adb_path: str = "adb",
+    max_workers: int = 8,
+    cache: MutableMapping[str, str] | None = None,
+    executor: Executor | None = None,
+) -> dict[str, str | None]:
+    """
+    Get hardware serial numbers for several devices concurrently.
+
+    mDNS device IDs are resolved in-process; the remaining devices each need an
+    ``adb shell getprop`` round-trip, which are issued in parallel so the total
+    latency is bounded by the slowest device instead of the sum of all of them.
+
+    If ``cache`` is given, device IDs found in it skip adb entirely and
+    successful lookups are written back, so a caller polling the same devices
+    only pays the subprocess cost once per new connection.
+
+    Args:
+        device_ids: Device IDs to resolve
+        adb_path: Path to adb executable (default: "adb")
+        max_workers: Upper bound on concurrent adb subprocesses
+        cache: Optional device_id → serial mapping reused across calls
+        executor: Optional long-lived pool to run lookups on; by default a
+            temporary pool of up to ``max_workers`` threads is created per call
+
+    Returns:
+        Mapping of device_id to serial (None if the lookup failed)
+    """
+    serials: dict[str, str | None] = {}
+    pending: list[str] = []
+
+    for device_id in device_ids:
+        cached = cache.get(device_id) if cache is not None else None
+        if cached:
+            serials[device_id] = cached
+            continue
+        mdns_serial = extract_serial_from_mdns(device_id)
+        if mdns_serial:
+            serials[device_id] = mdns_serial
+        else:
+            pending.append(device_id)
+
+    if len(pending) == 1:
+        serials[pending[0]] = get_device_serial(pending[0], adb_path)
+    elif pending:
+        # 调用方传入的线程池不归本函数关闭，用 nullcontext 包一层
+        pool = (
+            nullcontext(executor)
+            if executor is not None
+            else ThreadPoolExecutor(
+                max_workers=min(max_workers, len(pending)),
+                thread_name_prefix="adb-serial",
+            )
+        )
+        with pool as pool_executor:
+            results = pool_executor.map(
+                lambda device_id: get_device_serial(device_id, adb_path), pending
+            )
+            serials.update(zip(pending, results))
+
+    if cache is not None:
+        for device_id in pending:
+            serial = serials[device_id]
+            if serial:
+                cache[device_id] = serial
+
+    return serials
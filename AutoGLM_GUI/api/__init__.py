@@ -1,22 +1,28 @@
 """FastAPI application factory and route registration."""
 
 import asyncio
+import os
 import sys
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
 from importlib.resources import files
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from AutoGLM_GUI.adb_plus.qr_pair import qr_pairing_manager
+from AutoGLM_GUI.logger import logger
 from AutoGLM_GUI.version import APP_VERSION
 
 from . import agents, control, devices, mcp, media, metrics, version, workflows
+from .responses import ORJSONResponse
 
 
+@lru_cache(maxsize=1)
 def _get_static_dir() -> Path | None:
     """Locate packaged static assets."""
     # Priority 1: PyInstaller bundled path (for packaged executable)
@@ -41,6 +47,25 @@ def _get_static_dir() -> Path | None:
     return None
 
 
+async def _supervise_background_tasks(tasks: list[asyncio.Task]) -> None:
+    """监督后台任务：记录异常退出的任务，被取消时统一取消并回收所有子任务."""
+    try:
+        while tasks:
+            done, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    logger.opt(exception=task.exception()).error(
+                        f"Background task {task.get_name()} crashed"
+                    )
+            tasks = list(pending)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def create_app() -> FastAPI:
     """Build the FastAPI app with routers and static assets."""
 
@@ -52,30 +77,52 @@ def create_app() -> FastAPI:
     async def combined_lifespan(app: FastAPI):
         """Combine app startup logic with MCP lifespan."""
         # App startup
-        asyncio.create_task(qr_pairing_manager.cleanup_expired_sessions())
-
         from AutoGLM_GUI.device_manager import DeviceManager
 
         device_manager = DeviceManager.get_instance()
-        device_manager.start_polling()
+
+        # 所有后台任务挂在同一个 supervisor 下，保证异常可见、关闭时确定性取消
+        app.state.background = asyncio.create_task(
+            _supervise_background_tasks(
+                [
+                    asyncio.create_task(
+                        qr_pairing_manager.cleanup_expired_sessions(),
+                        name="QRPair-Cleanup",
+                    ),
+                    device_manager.start_polling(),
+                ]
+            ),
+            name="Background-Supervisor",
+        )
 
         # Run MCP lifespan
         async with mcp_app.lifespan(app):
             yield
 
-        # App shutdown (if needed in the future)
+        # App shutdown
+        app.state.background.cancel()
+        with suppress(asyncio.CancelledError):
+            await app.state.background
+        device_manager.stop_polling()
 
     # Create FastAPI app with combined lifespan
     app = FastAPI(
-        title="AutoGLM-GUI API", version=APP_VERSION, lifespan=combined_lifespan
+        title="AutoGLM-GUI API",
+        version=APP_VERSION,
+        lifespan=combined_lifespan,
+        # 以 Default() 包装：声明了 response_model 的路由仍走 FastAPI 的
+        # pydantic dump_json 快速路径，其余返回 dict 的路由使用 orjson
+        default_response_class=Default(ORJSONResponse),
     )
 
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["http://localhost:3000"],
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        # 显式列出实际使用的方法/请求头，并让浏览器缓存预检结果
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["content-type", "authorization", "if-none-match"],
+        max_age=86400,
     )
 
     app.include_router(agents.router)
@@ -95,12 +142,16 @@ def create_app() -> FastAPI:
         if assets_dir.exists():
             app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
 
+        # Resolve once; per-request lookups use plain string paths
+        static_root = os.fspath(static_dir)
+        index_path = os.path.join(static_root, "index.html")
+
         # Define SPA serving function
         async def serve_spa(full_path: str) -> FileResponse:
-            file_path = static_dir / full_path
-            if file_path.is_file():
+            file_path = os.path.join(static_root, full_path)
+            if os.path.isfile(file_path):
                 return FileResponse(file_path)
-            return FileResponse(static_dir / "index.html")
+            return FileResponse(index_path)
 
         # Add catch-all route AFTER all mounts to ensure lower priority
         app.add_api_route(
@@ -1,16 +1,20 @@
 """Agent lifecycle and chat routes."""
 
-import json
-import queue
-import threading
+import asyncio
 from typing import Any
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 
+from AutoGLM_GUI.adb_plus import ADBKeyboardInstaller
+from AutoGLM_GUI.api.routing import ORJSONRoute
 from AutoGLM_GUI.config import config
+from AutoGLM_GUI.config_manager import ConfigModel, config_manager
+from AutoGLM_GUI.exceptions import AgentNotInitializedError, DeviceBusyError
 from AutoGLM_GUI.logger import logger
+from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
 from AutoGLM_GUI.phone_agent_patches import apply_patches
 from AutoGLM_GUI.schemas import (
     AbortRequest,
@@ -22,6 +26,7 @@ from AutoGLM_GUI.schemas import (
     ConfigSaveRequest,
     InitRequest,
     ResetRequest,
+    SimpleOpResponse,
     StatusResponse,
 )
 from AutoGLM_GUI.state import (
@@ -34,7 +39,7 @@ from phone_agent.model import ModelConfig
 # Apply monkey patches to phone_agent
 apply_patches()
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 def _setup_adb_keyboard(device_id: str) -> None:
@@ -43,8 +48,6 @@ def _setup_adb_keyboard(device_id: str) -> None:
     Args:
         device_id: 设备 ID
     """
-    from AutoGLM_GUI.adb_plus import ADBKeyboardInstaller
-
     logger.info(f"Checking ADB Keyboard for device {device_id}...")
     installer = ADBKeyboardInstaller(device_id=device_id)
     status = installer.get_status()
@@ -75,8 +78,6 @@ def _initialize_agent_with_config(
     Raises:
         Exception: 初始化失败时抛出异常
     """
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     # Setup ADB Keyboard first
     _setup_adb_keyboard(device_id)
 
@@ -91,6 +92,13 @@ def _initialize_agent_with_config(
     logger.info(f"Agent initialized successfully for device {device_id}")
 
 
+def _reload_config() -> None:
+    """热重载配置文件并同步到环境变量（阻塞 I/O，需在线程中调用）."""
+    config_manager.load_file_config()
+    config_manager.sync_to_env()
+    config.refresh_from_env()
+
+
 def _create_sse_event(
     event_type: str, data: dict[str, Any], role: str = "assistant"
 ) -> dict[str, Any]:
@@ -99,11 +107,22 @@ def _create_sse_event(
     return event_data
 
 
-@router.post("/api/init")
-def init_agent(request: InitRequest) -> dict:
-    """初始化 PhoneAgent（多设备支持）。"""
-    from AutoGLM_GUI.config_manager import config_manager
+def _format_sse(event_type: str, event_data: dict[str, Any]) -> bytes:
+    """Frame an SSE event as a single bytes chunk (one ASGI send per event)."""
+    return b"event: %b\ndata: %b\n\n" % (event_type.encode(), orjson.dumps(event_data))
 
+
+_ABORTED_SSE = _format_sse(
+    "aborted",
+    _create_sse_event("aborted", {"message": "Chat aborted by user"}),
+)
+
+
+@router.post(
+    "/api/init", response_model=SimpleOpResponse, response_model_exclude_none=True
+)
+async def init_agent(request: InitRequest) -> SimpleOpResponse:
+    """初始化 PhoneAgent（多设备支持）。"""
     req_model_config = request.model or APIModelConfig()
     req_agent_config = request.agent or APIAgentConfig()
 
@@ -114,9 +133,7 @@ def init_agent(request: InitRequest) -> dict:
         )
 
     # 热重载配置文件（支持运行时手动修改）
-    config_manager.load_file_config()
-    config_manager.sync_to_env()
-    config.refresh_from_env()
+    await asyncio.to_thread(_reload_config)
 
     base_url = req_model_config.base_url or config.base_url
     api_key = req_model_config.api_key or config.api_key
@@ -148,24 +165,23 @@ def init_agent(request: InitRequest) -> dict:
 
     # Initialize agent (includes ADB Keyboard setup)
     try:
-        _initialize_agent_with_config(device_id, model_config, agent_config)
+        await asyncio.to_thread(
+            _initialize_agent_with_config, device_id, model_config, agent_config
+        )
     except Exception as e:
         logger.error(f"Failed to initialize agent: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-    return {
-        "success": True,
-        "device_id": device_id,
-        "message": f"Agent initialized for device {device_id}",
-    }
+    return SimpleOpResponse.model_construct(
+        success=True,
+        device_id=device_id,
+        message=f"Agent initialized for device {device_id}",
+    )
 
 
 @router.post("/api/chat", response_model=ChatResponse)
-def chat(request: ChatRequest) -> ChatResponse:
+async def chat(request: ChatRequest) -> ChatResponse:
     """发送任务给 Agent 并执行。"""
-    from AutoGLM_GUI.exceptions import DeviceBusyError
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     device_id = request.device_id
     manager = PhoneAgentManager.get_instance()
 
@@ -175,27 +191,30 @@ def chat(request: ChatRequest) -> ChatResponse:
             status_code=400, detail="Agent not initialized. Call /api/init first."
         )
 
-    # Use context manager for automatic lock management
-    try:
+    def run_chat() -> ChatResponse:
+        # Use context manager for automatic lock management
         with manager.use_agent(device_id, timeout=None) as agent:
             result = agent.run(request.message)
             steps = agent.step_count
             agent.reset()
-            return ChatResponse(result=result, steps=steps, success=True)
+            return ChatResponse.model_construct(
+                result=result, steps=steps, success=True
+            )
+
+    # 设备锁获取和 agent.run() 都是阻塞调用，放到线程中执行
+    try:
+        return await asyncio.to_thread(run_chat)
     except DeviceBusyError:
         raise HTTPException(
             status_code=409, detail=f"Device {device_id} is busy. Please wait."
         )
     except Exception as e:
-        return ChatResponse(result=str(e), steps=0, success=False)
+        return ChatResponse.model_construct(result=str(e), steps=0, success=False)
 
 
 @router.post("/api/chat/stream")
-def chat_stream(request: ChatRequest):
+async def chat_stream(request: ChatRequest):
     """发送任务给 Agent 并实时推送执行进度（SSE，多设备支持）。"""
-    from AutoGLM_GUI.exceptions import DeviceBusyError
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     device_id = request.device_id
     manager = PhoneAgentManager.get_instance()
 
@@ -206,18 +225,21 @@ def chat_stream(request: ChatRequest):
             detail=f"Device {device_id} not initialized. Call /api/init first.",
         )
 
-    def event_generator():
+    async def event_generator():
         """SSE 事件生成器."""
-        threads: list[threading.Thread] = []
+        loop = asyncio.get_running_loop()
+        step_task: asyncio.Task[Any] | None = None
 
         try:
-            # 创建事件队列用于 agent → SSE 通信
-            event_queue: queue.Queue[tuple[str, Any]] = queue.Queue()
+            # 创建事件队列用于 agent → SSE 通信（回调在工作线程中触发）
+            event_queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
 
             # 思考块回调
             def on_thinking_chunk(chunk: str):
                 chunk_data = _create_sse_event("thinking_chunk", {"chunk": chunk})
-                event_queue.put(("thinking_chunk", chunk_data))
+                loop.call_soon_threadsafe(
+                    event_queue.put_nowait, ("thinking_chunk", chunk_data)
+                )
 
             # 使用 streaming agent context manager（自动处理所有管理逻辑！）
             with manager.use_streaming_agent(
@@ -226,57 +248,48 @@ def chat_stream(request: ChatRequest):
                 # 早期 abort 检查
                 if stop_event.is_set():
                     logger.info(f"[Abort] Chat aborted before starting for {device_id}")
-                    yield "event: aborted\n"
-                    yield 'data: {"type": "aborted", "role": "assistant", "message": "Chat aborted by user"}\n\n'
+                    yield _ABORTED_SSE
                     return
 
-                # 在线程中运行 agent 步骤
-                step_result: list[Any] = [None]
-                error_result: list[Any] = [None]
-
                 def run_step(is_first: bool = True, task: str | None = None):
-                    try:
-                        if stop_event.is_set():
-                            return
-
-                        result = (
-                            streaming_agent.step(task)
-                            if is_first
-                            else streaming_agent.step()
-                        )
-
-                        if stop_event.is_set():
-                            return
-
-                        step_result[0] = result
-                    except Exception as e:
-                        error_result[0] = e
-                    finally:
-                        event_queue.put(("step_done", None))
+                    if stop_event.is_set():
+                        return None
+                    return (
+                        streaming_agent.step(task)
+                        if is_first
+                        else streaming_agent.step()
+                    )
+
+                def start_step(is_first: bool = True, task: str | None = None):
+                    # agent 步骤是阻塞调用，放到线程中执行；完成后通知事件循环
+                    task_ = asyncio.create_task(
+                        asyncio.to_thread(run_step, is_first, task)
+                    )
+                    task_.add_done_callback(
+                        lambda _: event_queue.put_nowait(("step_done", None))
+                    )
+                    return task_
 
                 # 启动第一步
-                thread = threading.Thread(
-                    target=run_step, args=(True, request.message), daemon=True
-                )
-                thread.start()
-                threads.append(thread)
+                step_task = start_step(True, request.message)
 
                 # 事件循环
                 while not stop_event.is_set():
                     try:
-                        event_type, event_data = event_queue.get(timeout=0.1)
-                    except queue.Empty:
+                        event_type, event_data = await asyncio.wait_for(
+                            event_queue.get(), timeout=0.1
+                        )
+                    except asyncio.TimeoutError:
                         continue
 
                     if event_type == "thinking_chunk":
-                        yield "event: thinking_chunk\n"
-                        yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+                        yield _format_sse("thinking_chunk", event_data)
 
                     elif event_type == "step_done":
-                        if error_result[0]:
-                            raise error_result[0]
+                        result = step_task.result()
+                        if result is None or stop_event.is_set():
+                            break
 
-                        result = step_result[0]
                         event_data = _create_sse_event(
                             "step",
                             {
@@ -288,8 +301,7 @@ def chat_stream(request: ChatRequest):
                             },
                         )
 
-                        yield "event: step\n"
-                        yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+                        yield _format_sse("step", event_data)
 
                         if result.finished:
                             done_data = _create_sse_event(
@@ -300,8 +312,7 @@ def chat_stream(request: ChatRequest):
                                     "success": result.success,
                                 },
                             )
-                            yield "event: done\n"
-                            yield f"data: {json.dumps(done_data, ensure_ascii=False)}\n\n"
+                            yield _format_sse("done", done_data)
                             break
 
                         if (
@@ -316,24 +327,16 @@ def chat_stream(request: ChatRequest):
                                     "success": result.success,
                                 },
                             )
-                            yield "event: done\n"
-                            yield f"data: {json.dumps(done_data, ensure_ascii=False)}\n\n"
+                            yield _format_sse("done", done_data)
                             break
 
                         # 启动下一步
-                        step_result[0] = None
-                        error_result[0] = None
-                        thread = threading.Thread(
-                            target=run_step, args=(False, None), daemon=True
-                        )
-                        thread.start()
-                        threads.append(thread)
+                        step_task = start_step(False, None)
 
                 # 检查是否被中止
                 if stop_event.is_set():
                     logger.info(f"[Abort] Streaming chat terminated for {device_id}")
-                    yield "event: aborted\n"
-                    yield 'data: {"type": "aborted", "role": "assistant", "message": "Chat aborted by user"}\n\n'
+                    yield _ABORTED_SSE
 
                 # 重置原始 agent（context 已由 use_streaming_agent 同步）
                 original_agent = manager.get_agent(device_id)
@@ -341,22 +344,19 @@ def chat_stream(request: ChatRequest):
 
         except DeviceBusyError:
             error_data = _create_sse_event("error", {"message": "Device is busy"})
-            yield "event: error\n"
-            yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+            yield _format_sse("error", error_data)
         except Exception as e:
             logger.exception(f"Error in streaming chat for {device_id}")
             error_data = _create_sse_event("error", {"message": str(e)})
-            yield "event: error\n"
-            yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+            yield _format_sse("error", error_data)
         finally:
             # 通知线程停止
             if "stop_event" in locals():
                 stop_event.set()
 
-            # 等待线程完成（带超时）
-            for thread in threads:
-                if thread.is_alive():
-                    thread.join(timeout=5.0)
+            # 等待仍在运行的步骤完成（带超时）
+            if step_task is not None and not step_task.done():
+                await asyncio.wait({step_task}, timeout=5.0)
 
     return StreamingResponse(
         event_generator(),
@@ -372,48 +372,46 @@ def chat_stream(request: ChatRequest):
 @router.get("/api/status", response_model=StatusResponse)
 def get_status(device_id: str | None = None) -> StatusResponse:
     """获取 Agent 状态和版本信息（多设备支持）。"""
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     manager = PhoneAgentManager.get_instance()
 
     if device_id is None:
-        return StatusResponse(
+        return StatusResponse.model_construct(
             version=APP_VERSION,
             initialized=len(manager.list_agents()) > 0,
             step_count=0,
         )
 
-    if not manager.is_initialized(device_id):
-        return StatusResponse(
+    # 单次加锁查找（不触发 get_agent 的自动初始化）
+    agent = manager.get_agent_safe(device_id)
+    if agent is None:
+        return StatusResponse.model_construct(
             version=APP_VERSION,
             initialized=False,
             step_count=0,
         )
 
-    agent = manager.get_agent(device_id)
-    return StatusResponse(
+    return StatusResponse.model_construct(
         version=APP_VERSION,
         initialized=True,
         step_count=agent.step_count,
     )
 
 
-@router.post("/api/reset")
-def reset_agent(request: ResetRequest) -> dict:
+@router.post(
+    "/api/reset", response_model=SimpleOpResponse, response_model_exclude_none=True
+)
+async def reset_agent(request: ResetRequest) -> SimpleOpResponse:
     """重置 Agent 状态（多设备支持）。"""
-    from AutoGLM_GUI.exceptions import AgentNotInitializedError
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     device_id = request.device_id
     manager = PhoneAgentManager.get_instance()
 
     try:
-        manager.reset_agent(device_id)
-        return {
-            "success": True,
-            "device_id": device_id,
-            "message": f"Agent reset for device {device_id}",
-        }
+        await asyncio.to_thread(manager.reset_agent, device_id)
+        return SimpleOpResponse.model_construct(
+            success=True,
+            device_id=device_id,
+            message=f"Agent reset for device {device_id}",
+        )
     except AgentNotInitializedError:
         raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
 
@@ -421,8 +419,6 @@ def reset_agent(request: ResetRequest) -> dict:
 @router.post("/api/chat/abort")
 def abort_chat(request: AbortRequest) -> dict:
     """中断正在进行的对话流。"""
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
-
     device_id = request.device_id
     manager = PhoneAgentManager.get_instance()
 
@@ -434,22 +430,30 @@ def abort_chat(request: AbortRequest) -> dict:
     }
 
 
+# (effective_config, conflicts, response)：两者均为 config_manager 内部缓存对象，
+# 只要对象身份不变（配置层未变化）就直接复用已构建的 ConfigResponse
+_config_response_cache: tuple[ConfigModel, list, ConfigResponse] | None = None
+
+
 @router.get("/api/config", response_model=ConfigResponse)
-def get_config_endpoint() -> ConfigResponse:
+async def get_config_endpoint() -> ConfigResponse:
     """获取当前有效配置."""
-    from AutoGLM_GUI.config_manager import config_manager
+    global _config_response_cache
 
-    # 热重载：检查文件是否被外部修改
-    config_manager.load_file_config()
+    # 热重载：检查文件是否被外部修改（mtime 未变时不会重新解析）
+    await asyncio.to_thread(config_manager.load_file_config)
 
-    # 获取有效配置和来源
+    # 获取有效配置和冲突（均由 config_manager 缓存）
     effective_config = config_manager.get_effective_config()
-    source = config_manager.get_config_source()
-
-    # 检测冲突
     conflicts = config_manager.detect_conflicts()
 
-    return ConfigResponse(
+    cached = _config_response_cache
+    if cached is not None and cached[0] is effective_config and cached[1] is conflicts:
+        return cached[2]
+
+    source = config_manager.get_config_source()
+
+    response = ConfigResponse.model_construct(
         base_url=effective_config.base_url,
         model_name=effective_config.model_name,
         api_key=effective_config.api_key if effective_config.api_key != "EMPTY" else "",
@@ -466,13 +470,15 @@ def get_config_endpoint() -> ConfigResponse:
         if conflicts
         else None,
     )
+    _config_response_cache = (effective_config, conflicts, response)
+    return response
 
 
-@router.post("/api/config")
-def save_config_endpoint(request: ConfigSaveRequest) -> dict:
+@router.post(
+    "/api/config", response_model=SimpleOpResponse, response_model_exclude_none=True
+)
+async def save_config_endpoint(request: ConfigSaveRequest) -> SimpleOpResponse:
     """保存配置到文件."""
-    from AutoGLM_GUI.config_manager import ConfigModel, config_manager
-
     try:
         # Validate incoming configuration to avoid silently falling back to defaults
         ConfigModel(
@@ -482,7 +488,8 @@ def save_config_endpoint(request: ConfigSaveRequest) -> dict:
         )
 
         # 保存配置（合并模式，不丢失字段）
-        success = config_manager.save_file_config(
+        success = await asyncio.to_thread(
+            config_manager.save_file_config,
             base_url=request.base_url,
             model_name=request.model_name,
             api_key=request.api_key,
@@ -499,21 +506,16 @@ def save_config_endpoint(request: ConfigSaveRequest) -> dict:
         # 检测冲突并返回警告
         conflicts = config_manager.detect_conflicts()
 
-        if conflicts:
-            warnings = [
-                f"{c.field}: file value overridden by {c.override_source.value}"
-                for c in conflicts
-            ]
-            return {
-                "success": True,
-                "message": f"Configuration saved to {config_manager.get_config_path()}",
-                "warnings": warnings,
-            }
+        warnings = [
+            f"{c.field}: file value overridden by {c.override_source.value}"
+            for c in conflicts
+        ]
 
-        return {
-            "success": True,
-            "message": f"Configuration saved to {config_manager.get_config_path()}",
-        }
+        return SimpleOpResponse.model_construct(
+            success=True,
+            message=f"Configuration saved to {config_manager.get_config_path()}",
+            warnings=warnings or None,
+        )
 
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=f"Invalid configuration: {e}")
@@ -521,18 +523,20 @@ def save_config_endpoint(request: ConfigSaveRequest) -> dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/api/config")
-def delete_config_endpoint() -> dict:
+@router.delete(
+    "/api/config", response_model=SimpleOpResponse, response_model_exclude_none=True
+)
+async def delete_config_endpoint() -> SimpleOpResponse:
     """删除配置文件."""
-    from AutoGLM_GUI.config_manager import config_manager
-
     try:
-        success = config_manager.delete_file_config()
+        success = await asyncio.to_thread(config_manager.delete_file_config)
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete config")
 
-        return {"success": True, "message": "Configuration deleted"}
+        return SimpleOpResponse.model_construct(
+            success=True, message="Configuration deleted"
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import time
+from functools import lru_cache
 
-from fastapi import APIRouter
-
-if TYPE_CHECKING:
-    from AutoGLM_GUI.device_manager import ManagedDevice
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
+from fastapi import APIRouter, Request, Response
+from phone_agent.adb import ADBConnection
 
+from AutoGLM_GUI.adb_plus import discover_mdns_devices
 from AutoGLM_GUI.adb_plus.qr_pair import qr_pairing_manager
+from AutoGLM_GUI.api.responses import ORJSONResponse
+from AutoGLM_GUI.device_manager import DeviceManager, ManagedDevice
 from AutoGLM_GUI.logger import logger
+from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
 
 from AutoGLM_GUI.schemas import (
     DeviceListResponse,
@@ -68,22 +71,113 @@ def _build_device_response_with_agent(
     return response
 
 
+@lru_cache(maxsize=1)
+def _get_adb_connection() -> ADBConnection:
+    """Shared ADBConnection (stateless apart from adb_path, safe to reuse)."""
+    return ADBConnection()
+
+
+def _schedule_refresh() -> None:
+    """刷新设备列表但不阻塞响应：唤醒轮询任务，轮询未启动时走统一的后台刷新."""
+    device_manager = DeviceManager.get_instance()
+    if not device_manager.request_refresh():
+        _start_fallback_refresh(device_manager)
+
+
+# 失败消息 → error 类型，按顺序匹配第一个命中的子串
+_CONNECT_WIFI_ERRORS: tuple[tuple[str, str], ...] = (
+    ("not found", "device_not_found"),
+    ("tcpip", "tcpip"),
+    ("ip", "ip"),
+)
+_PAIR_WIFI_ERRORS: tuple[tuple[str, str], ...] = (
+    ("connection failed", "connect_failed"),
+)
+
+
+def _classify_error(
+    message: str, table: tuple[tuple[str, str], ...], default: str
+) -> str:
+    """按匹配表从失败消息推断 error 类型（只做一次 lower()）."""
+    lowered = message.lower()
+    return next((kind for needle, kind in table if needle in lowered), default)
+
+
+_fallback_refresh: asyncio.Task | None = None
+
+
+def _start_fallback_refresh(device_manager: DeviceManager) -> None:
+    """Refresh the device list in the background (at most one in flight)."""
+    global _fallback_refresh
+
+    if _fallback_refresh is not None and not _fallback_refresh.done():
+        return
+    logger.warning("Polling not started, refreshing devices in background")
+    _fallback_refresh = asyncio.create_task(
+        asyncio.to_thread(device_manager.force_refresh)
+    )
+    _fallback_refresh.add_done_callback(_log_fallback_refresh_error)
+
+
+def _log_fallback_refresh_error(task: asyncio.Task) -> None:
+    """Surface refresh failures now instead of as an unretrieved exception."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error("Background device refresh failed")
+
+
+# 进程启动标识，避免服务重启后版本号从 0 重新计数导致 ETag 误命中
+_ETAG_EPOCH = f"{time.time_ns():x}"
+
+# 最近一次渲染的设备列表响应体，按 ETag 缓存：版本号未变时直接复用
+_device_list_body: tuple[str, bytes] | None = None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 匹配：支持 "*" 与逗号分隔的多个标签，按弱比较忽略 W/ 前缀."""
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
 router = APIRouter()
 
 
 @router.get("/api/devices", response_model=DeviceListResponse)
-def list_devices() -> DeviceListResponse:
-    """列出所有 ADB 设备及 Agent 状态."""
-    from AutoGLM_GUI.device_manager import DeviceManager
-    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
+async def list_devices(request: Request) -> Response:
+    """列出所有 ADB 设备及 Agent 状态.
 
+    支持 ETag / If-None-Match：设备列表与 Agent 元数据均未变化时返回 304。
+    """
     device_manager = DeviceManager.get_instance()
     agent_manager = PhoneAgentManager.get_instance()
 
-    # Fallback: 如果轮询未启动,执行同步获取
-    if not device_manager._poll_thread or not device_manager._poll_thread.is_alive():
-        logger.warning("Polling not started, performing synchronous device fetch")
-        device_manager.force_refresh()
+    # 有客户端在查看设备列表时，轮询切换到更短的间隔
+    device_manager.mark_client_active()
+
+    # Fallback: 轮询未启动时在后台刷新，先返回缓存列表并标记 stale
+    stale = not device_manager.is_polling
+    if stale:
+        _start_fallback_refresh(device_manager)
+
+    # stale 会进入响应体，因此也编入 ETag：轮询启停后客户端不会拿 304 沿用旧标记
+    etag = (
+        f'W/"{_ETAG_EPOCH}-{device_manager.version}-'
+        f'{agent_manager.version}-{int(stale)}"'
+    )
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    global _device_list_body
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _device_list_body is not None and _device_list_body[0] == etag:
+        return Response(
+            content=_device_list_body[1], media_type="application/json", headers=headers
+        )
 
     managed_devices = device_manager.get_devices()
 
@@ -92,60 +186,58 @@ def list_devices() -> DeviceListResponse:
         _build_device_response_with_agent(d, agent_manager) for d in managed_devices
     ]
 
-    return DeviceListResponse(devices=devices_with_agents)
+    # 服务端自有数据，直接交给 orjson 序列化，跳过 DeviceListResponse 校验
+    # （response_model 仍保留用于 OpenAPI 文档）
+    content: dict = {"devices": devices_with_agents}
+    if stale:
+        content["stale"] = True
+
+    response = ORJSONResponse(content=content, headers=headers)
+    _device_list_body = (etag, response.body)
+    return response
 
 
 @router.post("/api/devices/connect_wifi", response_model=WiFiConnectResponse)
-def connect_wifi(request: WiFiConnectRequest) -> WiFiConnectResponse:
+async def connect_wifi(request: WiFiConnectRequest) -> WiFiConnectResponse:
     """从 USB 启用 TCP/IP 并连接到 WiFi。"""
-    from AutoGLM_GUI.device_manager import DeviceManager
-
     device_manager = DeviceManager.get_instance()
-    success, message, wifi_id = device_manager.connect_wifi(
+    success, message, wifi_id = await asyncio.to_thread(
+        device_manager.connect_wifi,
         device_id=request.device_id,
         port=request.port,
     )
 
     if success:
         # Immediately refresh device list to show new WiFi device
-        device_manager.force_refresh()
+        _schedule_refresh()
 
-        return WiFiConnectResponse(
+        return WiFiConnectResponse.model_construct(
             success=True,
             message=message,
             device_id=wifi_id,
             address=wifi_id,
         )
     else:
-        # Determine error type from message
-        error_type = "connect"
-        if "not found" in message.lower():
-            error_type = "device_not_found"
-        elif "tcpip" in message.lower():
-            error_type = "tcpip"
-        elif "ip" in message.lower():
-            error_type = "ip"
-
-        return WiFiConnectResponse(
+        return WiFiConnectResponse.model_construct(
             success=False,
             message=message,
-            error=error_type,
+            error=_classify_error(message, _CONNECT_WIFI_ERRORS, "connect"),
         )
 
 
 @router.post("/api/devices/disconnect_wifi", response_model=WiFiDisconnectResponse)
-def disconnect_wifi(request: WiFiDisconnectRequest) -> WiFiDisconnectResponse:
+async def disconnect_wifi(request: WiFiDisconnectRequest) -> WiFiDisconnectResponse:
     """断开 WiFi 连接。"""
-    from AutoGLM_GUI.device_manager import DeviceManager
-
     device_manager = DeviceManager.get_instance()
-    success, message = device_manager.disconnect_wifi(request.device_id)
+    success, message = await asyncio.to_thread(
+        device_manager.disconnect_wifi, request.device_id
+    )
 
     if success:
         # Refresh device list to update status
-        device_manager.force_refresh()
+        _schedule_refresh()
 
-    return WiFiDisconnectResponse(
+    return WiFiDisconnectResponse.model_construct(
         success=success,
         message=message,
         error=None if success else "disconnect_failed",
@@ -155,49 +247,41 @@ def disconnect_wifi(request: WiFiDisconnectRequest) -> WiFiDisconnectResponse:
 @router.post(
     "/api/devices/connect_wifi_manual", response_model=WiFiManualConnectResponse
 )
-def connect_wifi_manual(
+async def connect_wifi_manual(
     request: WiFiManualConnectRequest,
 ) -> WiFiManualConnectResponse:
     """手动连接到 WiFi 设备 (直接连接,无需 USB)."""
-    from AutoGLM_GUI.device_manager import DeviceManager
-
     device_manager = DeviceManager.get_instance()
-    success, message, device_id = device_manager.connect_wifi_manual(
+    success, message, device_id = await asyncio.to_thread(
+        device_manager.connect_wifi_manual,
         ip=request.ip,
         port=request.port,
     )
 
     if success:
         # Refresh device list to show new device
-        device_manager.force_refresh()
+        _schedule_refresh()
 
-        return WiFiManualConnectResponse(
+        return WiFiManualConnectResponse.model_construct(
             success=True,
             message=message,
             device_id=device_id,
         )
     else:
-        # Determine error type from message
-        error_type = "connect_failed"
-        if "Invalid IP" in message:
-            error_type = "invalid_ip"
-        elif "Port must be" in message:
-            error_type = "invalid_port"
-
-        return WiFiManualConnectResponse(
+        # 参数格式已由 WiFiManualConnectRequest 校验，失败只可能来自 adb connect
+        return WiFiManualConnectResponse.model_construct(
             success=False,
             message=message,
-            error=error_type,
+            error="connect_failed",
         )
 
 
 @router.post("/api/devices/pair_wifi", response_model=WiFiPairResponse)
-def pair_wifi(request: WiFiPairRequest) -> WiFiPairResponse:
+async def pair_wifi(request: WiFiPairRequest) -> WiFiPairResponse:
     """使用无线调试配对并连接到 WiFi 设备 (Android 11+)."""
-    from AutoGLM_GUI.device_manager import DeviceManager
-
     device_manager = DeviceManager.get_instance()
-    success, message, device_id = device_manager.pair_wifi(
+    success, message, device_id = await asyncio.to_thread(
+        device_manager.pair_wifi,
         ip=request.ip,
         pairing_port=request.pairing_port,
         pairing_code=request.pairing_code,
@@ -206,44 +290,40 @@ def pair_wifi(request: WiFiPairRequest) -> WiFiPairResponse:
 
     if success:
         # Refresh device list to show newly paired device
-        device_manager.force_refresh()
+        _schedule_refresh()
 
-        return WiFiPairResponse(
+        return WiFiPairResponse.model_construct(
             success=True,
             message=message,
             device_id=device_id,
         )
     else:
-        # Determine error type from message
-        error_type = "connect_failed"
-        if "Invalid IP" in message:
-            error_type = "invalid_ip"
-        elif "port must be" in message.lower():
-            error_type = "invalid_port"
-        elif "Pairing code must be" in message:
-            error_type = "invalid_pairing_code"
-        elif "connection failed" not in message.lower():
-            error_type = "pair_failed"
-
-        return WiFiPairResponse(
+        return WiFiPairResponse.model_construct(
             success=False,
             message=message,
-            error=error_type,
+            error=_classify_error(message, _PAIR_WIFI_ERRORS, "pair_failed"),
         )
 
 
+# mDNS 扫描结果短时缓存：前端会反复轮询，adb mdns services 每次都要起子进程
+_MDNS_CACHE_TTL = 2.0
+_mdns_cache: tuple[float, MdnsDiscoverResponse] | None = None
+
+
 @router.get("/api/devices/discover_mdns", response_model=MdnsDiscoverResponse)
-def discover_mdns() -> MdnsDiscoverResponse:
+async def discover_mdns() -> MdnsDiscoverResponse:
     """Discover wireless ADB devices via mDNS."""
-    from phone_agent.adb import ADBConnection
-    from AutoGLM_GUI.adb_plus import discover_mdns_devices
+    global _mdns_cache
+
+    if _mdns_cache and time.monotonic() - _mdns_cache[0] < _MDNS_CACHE_TTL:
+        return _mdns_cache[1]
 
     try:
-        conn = ADBConnection()
-        devices = discover_mdns_devices(conn.adb_path)
+        conn = _get_adb_connection()
+        devices = await asyncio.to_thread(discover_mdns_devices, conn.adb_path)
 
         device_responses = [
-            MdnsDeviceResponse(
+            MdnsDeviceResponse.model_construct(
                 name=dev.name,
                 ip=dev.ip,
                 port=dev.port,
@@ -254,13 +334,15 @@ def discover_mdns() -> MdnsDiscoverResponse:
             for dev in devices
         ]
 
-        return MdnsDiscoverResponse(
+        response = MdnsDiscoverResponse.model_construct(
             success=True,
             devices=device_responses,
         )
+        _mdns_cache = (time.monotonic(), response)
+        return response
 
     except Exception as e:
-        return MdnsDiscoverResponse(
+        return MdnsDiscoverResponse.model_construct(
             success=False,
             devices=[],
             error=str(e),
@@ -271,7 +353,7 @@ def discover_mdns() -> MdnsDiscoverResponse:
 
 
 @router.post("/api/devices/qr_pair/generate", response_model=QRPairGenerateResponse)
-def generate_qr_pairing(timeout: int = 90) -> QRPairGenerateResponse:
+async def generate_qr_pairing(timeout: int = 90) -> QRPairGenerateResponse:
     """Generate QR code for wireless pairing and start mDNS listener.
 
     Args:
@@ -281,14 +363,13 @@ def generate_qr_pairing(timeout: int = 90) -> QRPairGenerateResponse:
         QR code payload and session information
     """
     try:
-        from phone_agent.adb import ADBConnection
-
-        conn = ADBConnection()
-        session = qr_pairing_manager.create_session(
-            timeout=timeout, adb_path=conn.adb_path
+        conn = _get_adb_connection()
+        # 启动 zeroconf 监听涉及网络 I/O，放到线程中执行
+        session = await asyncio.to_thread(
+            qr_pairing_manager.create_session, timeout=timeout, adb_path=conn.adb_path
         )
 
-        return QRPairGenerateResponse(
+        return QRPairGenerateResponse.model_construct(
             success=True,
             qr_payload=session.qr_payload,
             session_id=session.session_id,
@@ -296,31 +377,31 @@ def generate_qr_pairing(timeout: int = 90) -> QRPairGenerateResponse:
             message="QR code generated, listening for devices...",
         )
     except Exception as e:
-        return QRPairGenerateResponse(
+        return QRPairGenerateResponse.model_construct(
             success=False,
             message=f"Failed to generate QR pairing: {str(e)}",
             error="generation_failed",
         )
 
 
-def _get_status_message(status: str) -> str:
-    """Get user-friendly message for status code."""
-    messages = {
-        "listening": "等待手机扫描二维码...",
-        "pairing": "正在配对设备...",
-        "paired": "配对成功，正在连接...",
-        "connecting": "正在建立连接...",
-        "connected": "连接成功！",
-        "timeout": "超时：未检测到设备扫码",
-        "error": "配对失败",
-    }
-    return messages.get(status, "未知状态")
+# QR 配对状态 → 用户提示（模块级常量，避免每次轮询重建）
+_STATUS_MESSAGES: dict[str, str] = {
+    "listening": "等待手机扫描二维码...",
+    "pairing": "正在配对设备...",
+    "paired": "配对成功，正在连接...",
+    "connecting": "正在建立连接...",
+    "connected": "连接成功！",
+    "timeout": "超时：未检测到设备扫码",
+    "error": "配对失败",
+}
+_UNKNOWN_STATUS_MSG = "未知状态"
+_SESSION_NOT_FOUND_MSG = "Session not found or expired"
 
 
 @router.get(
     "/api/devices/qr_pair/status/{session_id}", response_model=QRPairStatusResponse
 )
-def get_qr_pairing_status(session_id: str) -> QRPairStatusResponse:
+async def get_qr_pairing_status(session_id: str) -> QRPairStatusResponse:
     """Get current status of a QR pairing session.
 
     Args:
@@ -329,27 +410,28 @@ def get_qr_pairing_status(session_id: str) -> QRPairStatusResponse:
     Returns:
         Current session status and device information if connected
     """
+    # 纯内存查找，直接在事件循环中执行
     session = qr_pairing_manager.get_session(session_id)
 
     if not session:
-        return QRPairStatusResponse(
+        return QRPairStatusResponse.model_construct(
             session_id=session_id,
             status="error",
-            message="Session not found or expired",
+            message=_SESSION_NOT_FOUND_MSG,
             error="session_not_found",
         )
 
-    return QRPairStatusResponse(
+    return QRPairStatusResponse.model_construct(
         session_id=session.session_id,
         status=session.status,
         device_id=session.device_id,
-        message=_get_status_message(session.status),
+        message=_STATUS_MESSAGES.get(session.status, _UNKNOWN_STATUS_MSG),
         error=session.error_message,
     )
 
 
 @router.delete("/api/devices/qr_pair/{session_id}", response_model=QRPairCancelResponse)
-def cancel_qr_pairing(session_id: str) -> QRPairCancelResponse:
+async def cancel_qr_pairing(session_id: str) -> QRPairCancelResponse:
     """Cancel an active QR pairing session.
 
     Args:
@@ -358,15 +440,16 @@ def cancel_qr_pairing(session_id: str) -> QRPairCancelResponse:
     Returns:
         Success status
     """
-    success = qr_pairing_manager.cancel_session(session_id)
+    # cancel_session 会 join 监听线程（最多 2s），放到线程中执行
+    success = await asyncio.to_thread(qr_pairing_manager.cancel_session, session_id)
 
     if success:
-        return QRPairCancelResponse(
+        return QRPairCancelResponse.model_construct(
             success=True,
             message="Pairing session cancelled",
         )
     else:
-        return QRPairCancelResponse(
+        return QRPairCancelResponse.model_construct(
             success=False,
             message="Session not found or already completed",
         )
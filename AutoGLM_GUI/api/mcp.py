@@ -108,7 +108,7 @@ def list_devices() -> List[Dict[str, Any]]:
     agent_manager = PhoneAgentManager.get_instance()
 
     # Fallback: 如果轮询未启动，执行同步刷新
-    if not device_manager._poll_thread or not device_manager._poll_thread.is_alive():
+    if not device_manager.is_polling:
         logger.warning("Polling not started, performing sync refresh")
         device_manager.force_refresh()
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import APIRouter
 
 from AutoGLM_GUI.adb_plus import capture_screenshot
@@ -15,9 +17,9 @@ router = APIRouter()
 @router.post("/api/video/reset")
 async def reset_video_stream(device_id: str | None = None) -> dict:
     """Reset active scrcpy streams (Socket.IO)."""
-    stop_streamers(device_id=device_id)
+    await stop_streamers(device_id=device_id)
     if device_id:
-        logger.info("Video stream reset for device %s", device_id)
+        logger.info("Video stream reset for device {}", device_id)
         return {
             "success": True,
             "message": f"Video stream reset for device {device_id}",
@@ -27,10 +29,12 @@ async def reset_video_stream(device_id: str | None = None) -> dict:
 
 
 @router.post("/api/screenshot", response_model=ScreenshotResponse)
-def take_screenshot(request: ScreenshotRequest) -> ScreenshotResponse:
+async def take_screenshot(request: ScreenshotRequest) -> ScreenshotResponse:
     """获取设备截图。此操作无副作用，不影响 PhoneAgent 运行。"""
     try:
-        screenshot = capture_screenshot(device_id=request.device_id)
+        screenshot = await asyncio.to_thread(
+            capture_screenshot, device_id=request.device_id
+        )
         return ScreenshotResponse(
             success=True,
             image=screenshot.base64_data,
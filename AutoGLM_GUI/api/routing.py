@@ -0,0 +1,32 @@
+"""Custom request/route classes for the FastAPI app."""
+
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson instead of stdlib json.
+
+    orjson.JSONDecodeError 继承自 json.JSONDecodeError，FastAPI 的 422 处理不受影响。
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute that hands endpoints an ORJSONRequest."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request) -> Response:
+            request = ORJSONRequest(request.scope, request.receive)
+            return await original_route_handler(request)
+
+        return custom_route_handler
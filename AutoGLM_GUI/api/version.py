@@ -17,7 +17,7 @@ router = APIRouter()
 # In-memory cache for version check results
 _version_cache: dict[str, Any] = {
     "data": None,
-    "timestamp": 0,
+    "timestamp": 0.0,  # time.monotonic() of the last fetch
     "ttl": 3600,  # 1 hour cache TTL
 }
 
@@ -129,7 +129,7 @@ def check_version() -> VersionCheckResponse:
     Returns:
         VersionCheckResponse with update information
     """
-    current_time = time.time()
+    current_time = time.monotonic()
 
     # Check if cache is still valid
     if (
@@ -1,45 +1,43 @@
 """Workflow API 路由."""
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
+from AutoGLM_GUI.api.routing import ORJSONRoute
 from AutoGLM_GUI.schemas import (
     WorkflowCreate,
     WorkflowListResponse,
     WorkflowResponse,
     WorkflowUpdate,
 )
+from AutoGLM_GUI.workflow_manager import workflow_manager
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 @router.get("/api/workflows", response_model=WorkflowListResponse)
-def list_workflows() -> WorkflowListResponse:
+async def list_workflows() -> WorkflowListResponse:
     """获取所有 workflows."""
-    from AutoGLM_GUI.workflow_manager import workflow_manager
-
-    workflows = workflow_manager.list_workflows()
+    workflows = await asyncio.to_thread(workflow_manager.list_workflows)
     return WorkflowListResponse(workflows=workflows)
 
 
 @router.get("/api/workflows/{workflow_uuid}", response_model=WorkflowResponse)
-def get_workflow(workflow_uuid: str) -> WorkflowResponse:
+async def get_workflow(workflow_uuid: str) -> WorkflowResponse:
     """获取单个 workflow."""
-    from AutoGLM_GUI.workflow_manager import workflow_manager
-
-    workflow = workflow_manager.get_workflow(workflow_uuid)
+    workflow = await asyncio.to_thread(workflow_manager.get_workflow, workflow_uuid)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
     return WorkflowResponse(**workflow)
 
 
 @router.post("/api/workflows", response_model=WorkflowResponse)
-def create_workflow(request: WorkflowCreate) -> WorkflowResponse:
+async def create_workflow(request: WorkflowCreate) -> WorkflowResponse:
     """创建新 workflow."""
-    from AutoGLM_GUI.workflow_manager import workflow_manager
-
     try:
-        workflow = workflow_manager.create_workflow(
-            name=request.name, text=request.text
+        workflow = await asyncio.to_thread(
+            workflow_manager.create_workflow, name=request.name, text=request.text
         )
         return WorkflowResponse(**workflow)
     except Exception as e:
@@ -47,12 +45,15 @@ def create_workflow(request: WorkflowCreate) -> WorkflowResponse:
 
 
 @router.put("/api/workflows/{workflow_uuid}", response_model=WorkflowResponse)
-def update_workflow(workflow_uuid: str, request: WorkflowUpdate) -> WorkflowResponse:
+async def update_workflow(
+    workflow_uuid: str, request: WorkflowUpdate
+) -> WorkflowResponse:
     """更新 workflow."""
-    from AutoGLM_GUI.workflow_manager import workflow_manager
-
-    workflow = workflow_manager.update_workflow(
-        uuid=workflow_uuid, name=request.name, text=request.text
+    workflow = await asyncio.to_thread(
+        workflow_manager.update_workflow,
+        uuid=workflow_uuid,
+        name=request.name,
+        text=request.text,
     )
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
@@ -60,11 +61,9 @@ def update_workflow(workflow_uuid: str, request: WorkflowUpdate) -> WorkflowResp
 
 
 @router.delete("/api/workflows/{workflow_uuid}")
-def delete_workflow(workflow_uuid: str) -> dict:
+async def delete_workflow(workflow_uuid: str) -> dict:
     """删除 workflow."""
-    from AutoGLM_GUI.workflow_manager import workflow_manager
-
-    success = workflow_manager.delete_workflow(workflow_uuid)
+    success = await asyncio.to_thread(workflow_manager.delete_workflow, workflow_uuid)
     if not success:
         raise HTTPException(status_code=404, detail="Workflow not found")
     return {"success": True, "message": "Workflow deleted"}
@@ -164,12 +164,18 @@ class UnifiedConfigManager:
         self._file_cache: Optional[dict] = None
         self._file_mtime: Optional[float] = None
 
-        # 有效配置缓存
+        # 有效配置 / 冲突检测缓存（任一配置层变化时一并清除）
         self._effective_config: Optional[ConfigModel] = None
+        self._conflicts: Optional[list[ConfigConflict]] = None
 
         self._initialized = True
         logger.debug("UnifiedConfigManager initialized")
 
+    def _invalidate_cache(self) -> None:
+        """清除有效配置和冲突检测缓存（配置层变化后调用）."""
+        self._effective_config = None
+        self._conflicts = None
+
     # ==================== 配置加载 ====================
 
     def set_cli_config(
@@ -192,7 +198,7 @@ class UnifiedConfigManager:
             api_key=api_key,
             source=ConfigSource.CLI,
         )
-        self._effective_config = None  # 清除缓存
+        self._invalidate_cache()
         logger.debug(f"CLI config set: {self._cli_layer.to_dict()}")
 
     def load_env_config(self) -> None:
@@ -214,7 +220,7 @@ class UnifiedConfigManager:
             api_key=api_key if api_key else None,
             source=ConfigSource.ENV,
         )
-        self._effective_config = None  # 清除缓存
+        self._invalidate_cache()
         logger.debug(f"Environment config loaded: {self._env_layer.to_dict()}")
 
     def load_file_config(self, force_reload: bool = False) -> bool:
@@ -233,10 +239,13 @@ class UnifiedConfigManager:
         """
         if not self._config_path.exists():
             logger.debug(f"Config file not found: {self._config_path}")
+            if self._file_mtime is None and self._file_cache is None:
+                # 之前也没有文件，配置层未变化，保留缓存
+                return False
             self._file_layer = ConfigLayer(source=ConfigSource.FILE)
             self._file_cache = None
             self._file_mtime = None
-            self._effective_config = None
+            self._invalidate_cache()
             return False
 
         try:
@@ -247,7 +256,7 @@ class UnifiedConfigManager:
             if (
                 not force_reload
                 and self._file_mtime == current_mtime
-                and self._file_cache
+                and self._file_cache is not None
             ):
                 logger.debug("Using cached config file (file unchanged)")
                 return False
@@ -267,7 +276,7 @@ class UnifiedConfigManager:
                 api_key=config_data.get("api_key"),
                 source=ConfigSource.FILE,
             )
-            self._effective_config = None  # 清除缓存
+            self._invalidate_cache()
 
             logger.info(f"Config file loaded from {self._config_path}")
             return True
@@ -277,14 +286,14 @@ class UnifiedConfigManager:
             self._file_layer = ConfigLayer(source=ConfigSource.FILE)
             self._file_cache = None
             self._file_mtime = None
-            self._effective_config = None
+            self._invalidate_cache()
             return False
         except Exception as e:
             logger.error(f"Failed to read config file: {e}")
             self._file_layer = ConfigLayer(source=ConfigSource.FILE)
             self._file_cache = None
             self._file_mtime = None
-            self._effective_config = None
+            self._invalidate_cache()
             return False
 
     def save_file_config(
@@ -366,7 +375,7 @@ class UnifiedConfigManager:
             self._file_cache = None
             self._file_mtime = None
             self._file_layer = ConfigLayer(source=ConfigSource.FILE)
-            self._effective_config = None
+            self._invalidate_cache()
             logger.info(f"Configuration deleted: {self._config_path}")
             return True
         except Exception as e:
@@ -479,11 +488,15 @@ class UnifiedConfigManager:
         2. CLI 或 ENV 有该字段的不同值（覆盖）
 
         Returns:
-            list[ConfigConflict]: 冲突列表
+            list[ConfigConflict]: 冲突列表（缓存至配置层变化，调用方勿修改）
         """
+        if self._conflicts is not None:
+            return self._conflicts
+
         conflicts = []
 
         if not self._file_layer.to_dict():
+            self._conflicts = conflicts
             return conflicts  # 无文件配置，无冲突
 
         for key in ["base_url", "model_name", "api_key"]:
@@ -517,6 +530,8 @@ class UnifiedConfigManager:
                     )
                 )
 
+        # 列表填充完成后再发布缓存，并发调用方不会拿到半成品
+        self._conflicts = conflicts
         return conflicts
 
     # ==================== 环境变量同步 ====================
@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
+import re
 import threading
 import time
-from collections import defaultdict
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Optional
-
-from phone_agent.adb.connection import ADBConnection, ConnectionType, DeviceInfo
-
+from typing import NamedTuple, Optional
+
+from AutoGLM_GUI.adb_plus import (
+    discover_mdns_devices,
+    extract_serial_from_mdns,
+    get_device_serials,
+    get_wifi_ip,
+    pair_device,
+    supports_mdns_services,
+)
 from AutoGLM_GUI.logger import logger
+from phone_agent.adb.connection import ADBConnection, ConnectionType, DeviceInfo
 
 
 class DeviceState(str, Enum):
@@ -23,42 +33,58 @@ class DeviceState(str, Enum):
     AVAILABLE_MDNS = "available"  # Discovered via mDNS but not connected
 
 
-@dataclass
-class DeviceConnection:
-    """Single connection method for a device (USB, WiFi, mDNS, etc.)."""
+# Enum member → plain str, so to_dict() skips the Enum.value descriptor
+_CONNECTION_TYPE_VALUES: dict[ConnectionType, str] = {
+    ct: ct.value for ct in ConnectionType
+}
+_STATE_VALUES: dict[DeviceState, str] = {state: state.value for state in DeviceState}
 
-    device_id: str  # USB serial OR IP:port
-    connection_type: ConnectionType
-    status: str  # "device" | "offline" | "unauthorized"
-    last_seen: float = field(default_factory=time.time)
+# Disconnected devices stay listed for UX continuity, then are dropped (seconds)
+_DISCONNECTED_TTL_S = 3600.0
 
-    def priority_score(self) -> int:
-        """Calculate connection priority for sorting.
+# Connection priority (higher is better): type dominates, status breaks ties
+_TYPE_PRIORITY: dict[ConnectionType, int] = {
+    ConnectionType.USB: 300,
+    ConnectionType.WIFI: 200,
+    ConnectionType.REMOTE: 200,
+}
+_STATUS_PRIORITY: dict[str, int] = {
+    "device": 30,
+    "offline": 20,
+    "unauthorized": 10,
+}
 
-        Priority:
-        1. Connection type (USB > WiFi/Remote > mDNS)
-        2. Status (device > offline > unauthorized)
-        """
-        # Type priority (higher is better)
-        type_priority = {
-            ConnectionType.USB: 300,
-            ConnectionType.WIFI: 200,
-            ConnectionType.REMOTE: 200,
-        }
 
-        # Status priority
-        status_priority = {
-            "device": 30,
-            "offline": 20,
-            "unauthorized": 10,
-        }
+class DeviceConnection(NamedTuple):
+    """Single connection method for a device (USB, WiFi, mDNS, etc.).
 
-        return type_priority.get(self.connection_type, 0) + status_priority.get(
-            self.status, 0
-        )
+    不可变；请用 _new_connection() 构造，以便预先算好 score。
+    """
+
+    device_id: str  # USB serial OR IP:port
+    connection_type: ConnectionType
+    status: str  # "device" | "offline" | "unauthorized"
+    last_seen: float
+    # Connection priority (higher is better):
+    # 1. Connection type (USB > WiFi/Remote > mDNS)
+    # 2. Status (device > offline > unauthorized)
+    score: int
+
+
+def _new_connection(
+    device_id: str, connection_type: ConnectionType, status: str, last_seen: float
+) -> DeviceConnection:
+    """Create a DeviceConnection with its priority score precomputed."""
+    return DeviceConnection(
+        device_id,
+        connection_type,
+        status,
+        last_seen,
+        _TYPE_PRIORITY.get(connection_type, 0) + _STATUS_PRIORITY.get(status, 0),
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class ManagedDevice:
     """Device information aggregated by serial (multiple connections supported)."""
 
@@ -78,8 +104,16 @@ class ManagedDevice:
     # Timestamps
     first_seen: float = field(default_factory=time.time)
     last_seen: float = field(default_factory=time.time)
+    # Monotonic twin of last_seen for duration checks (immune to clock jumps)
+    last_seen_mono: float = field(default_factory=time.monotonic)
     error_count: int = 0  # Consecutive polling errors
 
+    # to_dict() field values, rebuilt by the poller after each in-place update
+    # (readers never store into it, so a concurrent read can't cache stale data)
+    _api_cache: Optional[tuple[str, str, str, str, str, str, bool]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     def primary_connection(self) -> DeviceConnection:
         """Get the primary connection."""
@@ -107,55 +141,82 @@ class ManagedDevice:
         if not self.connections:
             return
 
-        # Sort by priority (descending)
-        sorted_conns = sorted(
-            enumerate(self.connections),
-            key=lambda x: x[1].priority_score(),
-            reverse=True,
+        # 单次遍历取最高分；严格大于保证同分时保留靠前的连接
+        connections = self.connections
+        best_idx, best_score = 0, connections[0].score
+        for i in range(1, len(connections)):
+            score = connections[i].score
+            if score > best_score:
+                best_idx, best_score = i, score
+
+        self.primary_connection_idx = best_idx
+
+    def _api_values(self) -> tuple[str, str, str, str, str, str, bool]:
+        """to_dict() 的字段值（按键顺序），供只需比较内容的调用方免建字典。"""
+        cached = self._api_cache
+        if cached is not None:
+            return cached
+        return self._build_api_values()
+
+    def refresh_api_cache(self) -> None:
+        """Rebuild the cached to_dict() values; call after mutating the device."""
+        self._api_cache = self._build_api_values()
+
+    def _build_api_values(self) -> tuple[str, str, str, str, str, str, bool]:
+        conn = self.primary_connection
+        return (
+            conn.device_id,
+            self.serial,
+            self.model or "Unknown",
+            conn.status,
+            _CONNECTION_TYPE_VALUES[conn.connection_type],
+            _STATE_VALUES[self.state],
+            self.state is DeviceState.AVAILABLE_MDNS,
         )
 
-        self.primary_connection_idx = sorted_conns[0][0]
-
     def to_dict(self) -> dict:
         """转换为纯设备信息字典（不包含 Agent 状态）。
 
         Returns:
             dict: 设备基础信息，匹配 DeviceResponse schema（无 agent 字段）
         """
+        # 键为常量的字典字面量编译为 BUILD_CONST_KEY_MAP，比 dict(zip(...)) 更快
+        device_id, serial, model, status, connection_type, state, available_only = (
+            self._api_values()
+        )
         return {
-            "id": self.primary_device_id,
-            "serial": self.serial,
-            "model": self.model or "Unknown",
-            "status": self.status,
-            "connection_type": self.connection_type.value,
-            "state": self.state.value,
-            "is_available_only": self.state == DeviceState.AVAILABLE_MDNS,
+            "id": device_id,
+            "serial": serial,
+            "model": model,
+            "status": status,
+            "connection_type": connection_type,
+            "state": state,
+            "is_available_only": available_only,
         }
 
 
 # Helper functions
 
 
+# mDNS service names and hostname suffix, matched in one pass
+_MDNS_RE = re.compile(r"\._adb-tls-(?:connect|pairing)\._tcp|\.local\.")
+
+
 def _is_mdns_connection(device_id: str) -> bool:
     """Check if device_id is from mDNS discovery."""
-    mdns_patterns = [
-        "._adb-tls-connect._tcp",
-        "._adb-tls-pairing._tcp",
-        ".local.",  # mDNS hostname suffix
-    ]
-    return any(pattern in device_id for pattern in mdns_patterns)
+    return _MDNS_RE.search(device_id) is not None
 
 
 def _create_managed_device(
-    serial: str, device_infos: list[DeviceInfo]
+    serial: str, device_infos: list[DeviceInfo], now: float, now_mono: float
 ) -> ManagedDevice:
-    """Create ManagedDevice from DeviceInfo list."""
+    """Create ManagedDevice from DeviceInfo list (now/now_mono: poll timestamps)."""
     connections = [
-        DeviceConnection(
+        _new_connection(
             device_id=d.device_id,
             connection_type=d.connection_type,
             status=d.status,
-            last_seen=time.time(),
+            last_seen=now,
         )
         for d in device_infos
     ]
@@ -172,6 +233,9 @@ def _create_managed_device(
         serial=serial,
         connections=connections,
         model=model,
+        first_seen=now,
+        last_seen=now,
+        last_seen_mono=now_mono,
     )
 
     # Select primary connection
@@ -181,6 +245,7 @@ def _create_managed_device(
     managed.state = (
         DeviceState.ONLINE if managed.status == "device" else DeviceState.OFFLINE
     )
+    managed.refresh_api_cache()
 
     return managed
 
@@ -189,7 +254,7 @@ class DeviceManager:
     """Singleton manager for ADB device discovery and state management.
 
     Features:
-    - Background polling thread (every 10s)
+    - Background asyncio polling task (10s idle, faster while clients watch)
     - Thread-safe device state cache
     - Exponential backoff on ADB failures
     - Integration with existing state.agents
@@ -202,16 +267,51 @@ class DeviceManager:
         """Private constructor. Use get_instance() instead."""
         # Device state storage (indexed by serial now)
         self._devices: dict[str, ManagedDevice] = {}  # Key: serial
-        self._devices_lock = threading.RLock()  # Reentrant for nested calls
+        # Writers replace these dicts wholesale (copy-on-write); readers load the
+        # current reference without locking. The lock only serializes writers.
+        # Plain Lock, not RLock: no critical section re-enters it, so code
+        # holding it must use the dicts directly rather than public getters.
+        self._devices_lock = threading.Lock()
 
         # Reverse mapping for backward compatibility
         self._device_id_to_serial: dict[str, str] = {}  # Key: device_id -> serial
 
-        # Polling thread control
-        self._poll_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
+        # device_id -> serial lookups from previous polls; an entry lives as long
+        # as the device_id stays in `adb devices`, so getprop runs once per connection
+        self._serial_cache: dict[str, str] = {}
+        # device_id -> (adb status, consecutive failures, next retry monotonic time)
+        # for failed serial lookups; one flaky device backs off on its own
+        # instead of slowing down the whole polling loop
+        self._serial_failures: dict[str, tuple[str, int, float]] = {}
+        self._serial_retry_base = 2.0  # seconds, doubled per failure
+
+        # Merged device list cache (connected + mDNS); reset by polling
+        self._snapshot: Optional[tuple[ManagedDevice, ...]] = None
+
+        # Device list version (bumped whenever the visible device list changes)
+        self._version = 0
+        self._fingerprint: tuple = ()
+
+        # Polling task control
+        self._poll_task: Optional[asyncio.Task] = None
         self._poll_interval = 10.0  # seconds
 
+        # Immediate refresh wake-up (created inside the polling loop)
+        self._poll_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refresh_event: Optional[asyncio.Event] = None
+
+        # Adaptive polling: poll faster while a client is watching /api/devices
+        self._active_interval = 3.0  # seconds (matches frontend refresh cadence)
+        self._active_window = 10.0  # seconds since last client request
+        self._last_client_hit = 0.0  # time.monotonic() of last client request
+
+        # Change-driven polling: device changes tend to arrive in bursts
+        # (plug/unplug, USB→WiFi switch), so right after one we poll at half the
+        # time elapsed since it, starting at _change_interval and stretching
+        # geometrically back to the regular interval while nothing changes
+        self._change_interval = 1.0  # seconds
+        self._last_change = float("-inf")  # time.monotonic() of last change
+
         # Exponential backoff state
         self._current_interval = 10.0
         self._min_interval = 10.0
@@ -226,11 +326,31 @@ class DeviceManager:
         # mDNS discovery support
         self._mdns_supported: Optional[bool] = None  # Lazy check
         self._mdns_devices: dict[str, ManagedDevice] = {}  # Key: serial
+        # mDNS devices whose serial is not connected; maintained by polling
+        self._mdns_only: list[ManagedDevice] = []
+        # Guards _mdns_devices, _mdns_only and the snapshot rebuild, so mDNS
+        # updates never contend with connected-device writers.
+        # Lock ordering: _devices_lock before _mdns_lock, never the reverse.
+        self._mdns_lock = threading.Lock()
         self._enable_mdns_discovery: bool = True  # Feature toggle
+        # Runs `adb mdns services` alongside the device/serial queries
+        self._mdns_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="DeviceManager-mDNS"
+        )
+        # Concurrent getprop lookups for new device_ids; kept for the manager's
+        # lifetime so adds don't pay thread start-up on every poll
+        self._serial_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="DeviceManager-serial"
+        )
 
     @classmethod
     def get_instance(cls, adb_path: str = "adb") -> DeviceManager:
-        """Get singleton instance (thread-safe)."""
+        """Get singleton instance (thread-safe).
+
+        The hot path is one attribute read. Don't swap this for functools.cache:
+        it keys on adb_path (one instance per argument) and may run the
+        constructor twice when first calls race.
+        """
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
@@ -238,59 +358,81 @@ class DeviceManager:
                     logger.info("DeviceManager singleton created")
         return cls._instance
 
-    def start_polling(self) -> None:
-        """Start background polling thread."""
-        with self._devices_lock:
-            if self._poll_thread and self._poll_thread.is_alive():
-                logger.warning("Polling thread already running")
-                return
+    @property
+    def is_polling(self) -> bool:
+        """Whether the background polling task is running."""
+        return self._poll_task is not None and not self._poll_task.done()
 
-            self._stop_event.clear()
-            self._poll_thread = threading.Thread(
-                target=self._polling_loop, name="DeviceManager-Poll", daemon=True
-            )
-            self._poll_thread.start()
-            logger.info(
-                f"DeviceManager polling started (interval: {self._poll_interval:.1f}s)"
-            )
+    def start_polling(self) -> asyncio.Task:
+        """Start background polling task (must be called from the event loop).
+
+        Returns:
+            The polling task, so callers can supervise it.
+        """
+        if self.is_polling:
+            logger.warning("Polling task already running")
+            return self._poll_task
+
+        self._poll_task = asyncio.get_running_loop().create_task(
+            self._polling_loop(), name="DeviceManager-Poll"
+        )
+        logger.info(
+            "DeviceManager polling started (interval: {:.1f}s)", self._poll_interval
+        )
+        return self._poll_task
 
     def stop_polling(self) -> None:
-        """Stop background polling thread (graceful shutdown)."""
-        if not self._poll_thread:
+        """Stop background polling task (graceful shutdown)."""
+        if not self.is_polling:
             return
 
         logger.info("Stopping DeviceManager polling...")
-        self._stop_event.set()
+        self._poll_task.cancel()
+        self._poll_task = None
+        logger.info("DeviceManager polling stopped")
 
-        if self._poll_thread.is_alive():
-            self._poll_thread.join(timeout=5.0)
-            if self._poll_thread.is_alive():
-                logger.warning("Polling thread did not stop gracefully")
-            else:
-                logger.info("DeviceManager polling stopped")
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped whenever get_devices() output changes."""
+        return self._version
 
-    def get_devices(self) -> list[ManagedDevice]:
-        """Get all cached devices (connected + available mDNS)."""
-        with self._devices_lock:
-            # Merge connected and mDNS devices
-            all_devices = list(self._devices.values())
-
-            # Add mDNS devices that aren't already connected
-            connected_serials = set(self._devices.keys())
-            mdns_only = [
-                dev
-                for serial, dev in self._mdns_devices.items()
-                if serial not in connected_serials
-            ]
-
-            all_devices.extend(mdns_only)
+    def mark_client_active(self) -> None:
+        """Record a client request so polling switches to the active interval."""
+        self._last_client_hit = time.monotonic()
+
+    def _next_poll_interval(self) -> float:
+        """Interval until next poll: backoff on failure, faster while watched.
+
+        刚发生设备变化时按距变化时长的一半轮询（见 _change_interval）。
+        """
+        if self._consecutive_failures > 0:
+            return self._current_interval
+        now = time.monotonic()
+        interval = self._current_interval
+        if now - self._last_client_hit < self._active_window:
+            interval = self._active_interval
+        since_change = now - self._last_change
+        return min(interval, max(self._change_interval, since_change / 2))
+
+    def get_devices(self) -> tuple[ManagedDevice, ...]:
+        """Get all cached devices (connected + available mDNS).
+
+        返回的元组在两次轮询之间共享（不可变，调用方无法误改）。
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._mdns_lock:
+            # Merge connected and mDNS devices (mDNS-only list precomputed by polling)
+            all_devices = (*self._devices.values(), *self._mdns_only)
+            self._snapshot = all_devices
             return all_devices
 
     def get_device(self, device_id: str) -> Optional[ManagedDevice]:
         """Get single device info by ID (deprecated, use get_device_by_serial)."""
         # For backward compatibility, try to interpret as serial
-        with self._devices_lock:
-            return self._devices.get(device_id)
+        return self._devices.get(device_id)
 
     def get_device_by_device_id(self, device_id: str) -> Optional[ManagedDevice]:
         """Get device by any of its connection device_ids (backward compatibility).
@@ -299,23 +441,37 @@ class DeviceManager:
         - Serial number (direct lookup)
         - Any device_id from any connection (reverse mapping)
         """
-        with self._devices_lock:
-            # First try direct serial lookup (if device_id IS a serial)
-            if device_id in self._devices:
-                return self._devices[device_id]
+        devices = self._devices
+
+        # First try direct serial lookup (if device_id IS a serial)
+        device = devices.get(device_id)
+        if device is not None:
+            return device
 
-            # Use reverse mapping
-            serial = self._device_id_to_serial.get(device_id)
-            if serial:
-                return self._devices.get(serial)
+        # Use reverse mapping
+        serial = self._device_id_to_serial.get(device_id)
+        if serial:
+            return devices.get(serial)
 
-            return None
+        return None
 
     def force_refresh(self) -> None:
         """Trigger immediate device list refresh (blocking)."""
         logger.info("Force refreshing device list...")
         self._poll_devices()
 
+    def request_refresh(self) -> bool:
+        """Wake the polling task for an immediate refresh (non-blocking, thread-safe).
+
+        Returns:
+            False if polling is not running; caller should fall back to force_refresh().
+        """
+        loop, event = self._poll_loop, self._refresh_event
+        if not self.is_polling or loop is None or event is None:
+            return False
+        loop.call_soon_threadsafe(event.set)
+        return True
+
     # Internal methods
 
     def _check_mdns_support(self) -> bool:
@@ -326,8 +482,6 @@ class DeviceManager:
             True if supported, False otherwise
         """
         if self._mdns_supported is None:
-            from AutoGLM_GUI.adb_plus.version import supports_mdns_services
-
             self._mdns_supported = supports_mdns_services(self._adb_path)
 
             if self._mdns_supported:
@@ -337,13 +491,16 @@ class DeviceManager:
 
         return self._mdns_supported
 
-    def _polling_loop(self) -> None:
-        """Background polling loop (runs in thread)."""
+    async def _polling_loop(self) -> None:
+        """Background polling loop (runs as an asyncio task)."""
         logger.debug("Polling loop started")
+        self._poll_loop = asyncio.get_running_loop()
+        self._refresh_event = asyncio.Event()
 
-        while not self._stop_event.is_set():
+        while True:
             try:
-                self._poll_devices()
+                # ADB calls are blocking subprocesses, keep them off the event loop
+                await asyncio.to_thread(self._poll_devices)
 
                 # Reset backoff on success
                 if self._consecutive_failures > 0:
@@ -354,156 +511,184 @@ class DeviceManager:
             except Exception as e:
                 self._handle_poll_error(e)
 
-            # Sleep with interruptible wait
-            self._stop_event.wait(timeout=self._current_interval)
+            # Sleep until next tick, or wake early on request_refresh()
+            try:
+                await asyncio.wait_for(
+                    self._refresh_event.wait(), timeout=self._next_poll_interval()
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_event.clear()
 
     def _poll_devices(self) -> None:
         """Poll ADB device list and update cache (serial-based aggregation)."""
-        from AutoGLM_GUI.adb_plus import get_device_serial
 
-        # Step 1: Get ADB devices and fetch serials
+        # 单次轮询内的所有时间戳共用一个值（wall clock 用于展示，monotonic 用于超时判断）
+        now = time.time()
+        now_mono = time.monotonic()
+
+        # mDNS 扫描与 adb devices / getprop 互不依赖，提前在后台发起，
+        # 整次轮询耗时取两者较大值而不是相加
+        mdns_future: Optional[Future] = None
+        if self._enable_mdns_discovery and self._check_mdns_support():
+            mdns_future = self._mdns_executor.submit(
+                discover_mdns_devices, self._adb_path
+            )
+
+        # Step 1: Get ADB devices and fetch serials (concurrently)
         adb_devices = self._adb_conn.list_devices()
-        device_with_serials: list[tuple[DeviceInfo, str]] = []
+        serials = self._fetch_serials(adb_devices, now_mono)
+
+        # Step 2: Group devices by serial, partitioned into (non-mDNS, mDNS)
+        grouped: dict[str, tuple[list[DeviceInfo], list[DeviceInfo]]] = {}
 
         for device_info in adb_devices:
-            serial = get_device_serial(device_info.device_id, self._adb_path)
+            serial = serials.get(device_info.device_id)
 
             if not serial:
-                # CRITICAL: Log error and skip this device
-                logger.error(
-                    f"Failed to get serial for device {device_info.device_id}. "
-                    f"Skipping this device. Check ADB access."
-                )
+                # Lookup failed or backing off (logged by _fetch_serials)
                 continue
 
-            device_with_serials.append((device_info, serial))
-
-        # Step 2: Group devices by serial
-        grouped_by_serial: dict[str, list[DeviceInfo]] = defaultdict(list)
-
-        for device_info, serial in device_with_serials:
-            grouped_by_serial[serial].append(device_info)
-
-        # Step 3: Filter mDNS connections (if other connections exist)
-        for serial, device_infos in grouped_by_serial.items():
-            filtered = []
-            has_non_mdns = False
-
-            # First pass: check if we have non-mDNS connections
-            for device_info in device_infos:
-                if not _is_mdns_connection(device_info.device_id):
-                    has_non_mdns = True
-                    break
-
-            # Second pass: filter out mDNS if non-mDNS exists
-            for device_info in device_infos:
-                if has_non_mdns and _is_mdns_connection(device_info.device_id):
-                    logger.debug(
-                        f"Filtering mDNS connection {device_info.device_id} "
-                        f"(device has clearer connection)"
-                    )
-                    continue
-                filtered.append(device_info)
-
-            grouped_by_serial[serial] = filtered
+            non_mdns, mdns = grouped.setdefault(serial, ([], []))
+            if _is_mdns_connection(device_info.device_id):
+                mdns.append(device_info)
+            else:
+                non_mdns.append(device_info)
+
+        # Step 3: Drop mDNS connections when a clearer connection exists
+        grouped_by_serial: dict[str, list[DeviceInfo]] = {}
+        for serial, (non_mdns, mdns) in grouped.items():
+            if non_mdns and mdns:
+                logger.debug(
+                    "Filtering {} mDNS connection(s) for {} "
+                    "(device has clearer connection)",
+                    len(mdns),
+                    serial,
+                )
+            grouped_by_serial[serial] = non_mdns or mdns
 
         # Step 4: Update device cache
+        # Copy-on-write：在副本上修改，最后整体替换引用，读者无需加锁。
+        # 已发布的 ManagedDevice 对象同样不可原地修改，变更一律构造新对象
         with self._devices_lock:
-            current_serials = set(grouped_by_serial.keys())
-            previous_serials = set(self._devices.keys())
-
-            added_serials = current_serials - previous_serials
-            removed_serials = previous_serials - current_serials
-            existing_serials = current_serials & previous_serials
-
-            # Add new devices
-            for serial in added_serials:
-                device_infos = grouped_by_serial[serial]
-                managed = _create_managed_device(serial, device_infos)
-                self._devices[serial] = managed
-
-                # Update reverse mapping
-                for conn in managed.connections:
-                    self._device_id_to_serial[conn.device_id] = serial
-
-                logger.info(
-                    f"Device added: {serial} ({managed.model or 'Unknown'}) "
-                    f"via {managed.connection_type.value} ({managed.primary_device_id})"
-                )
-
-            # Update existing devices
-            for serial in existing_serials:
-                device_infos = grouped_by_serial[serial]
-                managed = self._devices[serial]
-
-                # Rebuild connections
-                old_device_ids = {conn.device_id for conn in managed.connections}
-                new_connections = [
-                    DeviceConnection(
-                        device_id=d.device_id,
-                        connection_type=d.connection_type,
-                        status=d.status,
-                        last_seen=time.time(),
+            devices = dict(self._devices)
+            id_map = dict(self._device_id_to_serial)
+
+            # Single pass over current devices: add new ones, update known ones
+            for serial, device_infos in grouped_by_serial.items():
+                managed = devices.get(serial)
+                if managed is None:
+                    managed = _create_managed_device(
+                        serial, device_infos, now, now_mono
+                    )
+                    devices[serial] = managed
+
+                    # Update reverse mapping
+                    for conn in managed.connections:
+                        id_map[conn.device_id] = serial
+
+                    logger.info(
+                        "Device added: {} ({}) via {} ({})",
+                        serial,
+                        managed.model or "Unknown",
+                        managed.connection_type.value,
+                        managed.primary_device_id,
                     )
-                    for d in device_infos
-                ]
+                    continue
 
-                managed.connections = new_connections
-                managed.last_seen = time.time()
-                managed.error_count = 0
+                # Rebuild connections, reusing unchanged ones; the reverse
+                # mapping is updated in the same pass
+                old_connections = {conn.device_id: conn for conn in managed.connections}
+                new_connections = []
+                for d in device_infos:
+                    conn = old_connections.pop(d.device_id, None)
+                    if (
+                        conn is None
+                        or conn.status != d.status
+                        or conn.connection_type != d.connection_type
+                    ):
+                        conn = _new_connection(
+                            device_id=d.device_id,
+                            connection_type=d.connection_type,
+                            status=d.status,
+                            last_seen=now,
+                        )
+                    else:
+                        conn = conn._replace(last_seen=now)
+                    new_connections.append(conn)
+                    id_map[d.device_id] = serial
+
+                # Connections that disappeared since the last poll
+                for old_id in old_connections:
+                    id_map.pop(old_id, None)
 
                 # Update model if available
+                model = managed.model
                 for device_info in device_infos:
                     if device_info.model:
-                        managed.model = device_info.model
+                        model = device_info.model
                         break
 
+                # Build the updated device off to the side; it is only
+                # mutated before being published below
+                updated = replace(
+                    managed,
+                    connections=new_connections,
+                    model=model,
+                    last_seen=now,
+                    last_seen_mono=now_mono,
+                    error_count=0,
+                )
+
                 # Re-select primary connection
-                managed.select_primary_connection()
+                updated.select_primary_connection()
 
                 # Update state
-                managed.state = (
+                updated.state = (
                     DeviceState.ONLINE
-                    if managed.status == "device"
+                    if updated.status == "device"
                     else DeviceState.OFFLINE
                 )
+                updated.refresh_api_cache()
+                devices[serial] = updated
+
+            # Mark removed devices as disconnected; drop them after the grace period
+            for serial in devices.keys() - grouped_by_serial.keys():
+                managed = devices[serial]
+                if managed.state is DeviceState.DISCONNECTED:
+                    if now_mono - managed.last_seen_mono > _DISCONNECTED_TTL_S:
+                        del devices[serial]
+                        logger.debug("Dropped disconnected device: {}", serial)
+                    continue
 
-                # Update reverse mapping
-                new_device_ids = {conn.device_id for conn in managed.connections}
-
-                # Remove stale mappings
-                for old_id in old_device_ids - new_device_ids:
-                    self._device_id_to_serial.pop(old_id, None)
-
-                # Add new mappings
-                for new_id in new_device_ids:
-                    self._device_id_to_serial[new_id] = serial
-
-            # Mark removed devices as disconnected
-            for serial in removed_serials:
-                managed = self._devices[serial]
-                managed.state = DeviceState.DISCONNECTED
-                managed.last_seen = time.time()
+                updated = replace(
+                    managed,
+                    state=DeviceState.DISCONNECTED,
+                    last_seen=now,
+                    last_seen_mono=now_mono,
+                )
+                updated.refresh_api_cache()
+                devices[serial] = updated
                 logger.warning(
-                    f"Device disconnected: {serial} ({managed.model or 'Unknown'})"
+                    "Device disconnected: {} ({})", serial, managed.model or "Unknown"
                 )
 
                 # Remove reverse mappings
                 for conn in managed.connections:
-                    self._device_id_to_serial.pop(conn.device_id, None)
+                    id_map.pop(conn.device_id, None)
 
-        # Step 5: Discover mDNS devices (if enabled and supported)
-        if self._enable_mdns_discovery and self._check_mdns_support():
-            from AutoGLM_GUI.adb_plus import (
-                discover_mdns_devices,
-                extract_serial_from_mdns,
-            )
+            self._device_id_to_serial = id_map
+            self._devices = devices
+            with self._mdns_lock:
+                self._refresh_mdns_only()
 
+        # Step 5: Collect mDNS discovery results (if enabled and supported)
+        if mdns_future is not None:
             try:
-                mdns_devices = discover_mdns_devices(self._adb_path)
+                mdns_devices = mdns_future.result()
 
-                with self._devices_lock:
-                    connected_serials = set(self._devices.keys())
+                with self._mdns_lock:
+                    connected_serials = self._devices
 
                     # Process discovered mDNS devices
                     for mdns_dev in mdns_devices:
@@ -512,14 +697,17 @@ class DeviceManager:
 
                         if not serial:
                             logger.debug(
-                                f"Could not extract serial from mDNS device: {mdns_dev.name}"
+                                "Could not extract serial from mDNS device: {}",
+                                mdns_dev.name,
                             )
                             continue
 
                         # Skip if already connected
                         if serial in connected_serials:
                             logger.debug(
-                                f"mDNS device {mdns_dev.name} already connected as {serial}"
+                                "mDNS device {} already connected as {}",
+                                mdns_dev.name,
+                                serial,
                             )
                             continue
 
@@ -529,51 +717,166 @@ class DeviceManager:
                             available_device = ManagedDevice(
                                 serial=serial,
                                 connections=[
-                                    DeviceConnection(
+                                    _new_connection(
                                         device_id=f"{mdns_dev.ip}:{mdns_dev.port}",
                                         connection_type=ConnectionType.REMOTE,
                                         status="available",  # Not connected yet
-                                        last_seen=time.time(),
+                                        last_seen=now,
                                     )
                                 ],
                                 state=DeviceState.AVAILABLE_MDNS,
                                 model=None,  # Unknown until connected
+                                first_seen=now,
+                                last_seen=now,
+                                last_seen_mono=now_mono,
                             )
+                            available_device.refresh_api_cache()
                             self._mdns_devices[serial] = available_device
                             logger.info(
-                                f"Discovered mDNS device: {mdns_dev.name} at {mdns_dev.ip}:{mdns_dev.port}"
+                                "Discovered mDNS device: {} at {}:{}",
+                                mdns_dev.name,
+                                mdns_dev.ip,
+                                mdns_dev.port,
                             )
                         else:
-                            # Update last_seen
-                            self._mdns_devices[serial].last_seen = time.time()
+                            # Update last_seen (new object: readers may hold
+                            # the current one via _mdns_only / the snapshot)
+                            updated = replace(
+                                self._mdns_devices[serial],
+                                last_seen=now,
+                                last_seen_mono=now_mono,
+                            )
+                            updated.refresh_api_cache()
+                            self._mdns_devices[serial] = updated
 
                     # Clean up stale mDNS devices (not seen for 60s)
-                    current_time = time.time()
                     stale_serials = [
                         serial
                         for serial, dev in self._mdns_devices.items()
-                        if current_time - dev.last_seen > 60
+                        if now_mono - dev.last_seen_mono > 60
                     ]
                     for serial in stale_serials:
                         del self._mdns_devices[serial]
-                        logger.debug(f"Removed stale mDNS device: {serial}")
+                        logger.debug("Removed stale mDNS device: {}", serial)
+
+                    self._refresh_mdns_only()
 
             except Exception as e:
-                logger.debug(f"mDNS discovery failed: {e}")
+                logger.debug("mDNS discovery failed: {}", e)
+
+        # Step 6: Bump version if the visible device list changed
+        self._update_version(now_mono)
+
+    def _fetch_serials(
+        self, adb_devices: list[DeviceInfo], now_mono: float
+    ) -> dict[str, str | None]:
+        """Resolve serials for a poll, with caching and per-device retry backoff.
+
+        Device IDs still backing off after a failed lookup are skipped (mapped
+        to None) until their retry time, or until their adb status changes
+        (e.g. unauthorized → device), so they don't cost a getprop every poll.
+        """
+        device_ids = {d.device_id for d in adb_devices}
+        # 断开的 device_id 可能以后指向另一台设备（如复用的 IP:port），先淘汰
+        serial_cache = {
+            device_id: serial
+            for device_id, serial in self._serial_cache.items()
+            if device_id in device_ids
+        }
+        failures: dict[str, tuple[str, int, float]] = {}
+        lookup_ids: list[str] = []
+        for d in adb_devices:
+            failure = self._serial_failures.get(d.device_id)
+            if failure is not None and failure[0] == d.status:
+                failures[d.device_id] = failure
+                if now_mono < failure[2]:
+                    continue
+            lookup_ids.append(d.device_id)
+
+        serials = get_device_serials(
+            lookup_ids,
+            self._adb_path,
+            cache=serial_cache,
+            executor=self._serial_executor,
+        )
+        self._serial_cache = serial_cache
+
+        for d in adb_devices:
+            if d.device_id not in serials:
+                continue
+            if serials[d.device_id]:
+                failures.pop(d.device_id, None)
+                continue
+            count = failures[d.device_id][1] + 1 if d.device_id in failures else 1
+            delay = min(self._max_interval, self._serial_retry_base * 2 ** (count - 1))
+            failures[d.device_id] = (d.status, count, now_mono + delay)
+            if count == 1:
+                # CRITICAL: Log error and skip this device
+                logger.error(
+                    "Failed to get serial for device {}. "
+                    "Skipping this device. Check ADB access.",
+                    d.device_id,
+                )
+            else:
+                logger.debug(
+                    "Serial lookup for {} failed {} times, retrying in {:.0f}s",
+                    d.device_id,
+                    count,
+                    delay,
+                )
+        self._serial_failures = failures
+
+        return serials
+
+    def _refresh_mdns_only(self) -> None:
+        """Recompute the mDNS-only device list and drop the snapshot.
+
+        Caller must hold ``_mdns_lock``.
+        """
+        devices = self._devices
+        self._mdns_only = [
+            dev for serial, dev in self._mdns_devices.items() if serial not in devices
+        ]
+        self._snapshot = None
+
+    def _update_version(self, now_mono: float) -> None:
+        """Recompute device list fingerprint and bump version on change.
+
+        Args:
+            now_mono: time.monotonic() of the poll, recorded as the change time
+        """
+        devices = self.get_devices()
+        with self._devices_lock:
+            fingerprint = tuple(
+                (
+                    dev._api_values(),
+                    tuple(conn.device_id for conn in dev.connections),
+                )
+                for dev in devices
+            )
+            if fingerprint != self._fingerprint:
+                # 首次填充设备列表不算变化，不触发加速轮询
+                if self._version > 0:
+                    self._last_change = now_mono
+                self._fingerprint = fingerprint
+                self._version += 1
 
     def _handle_poll_error(self, error: Exception) -> None:
         """Handle polling failure with exponential backoff."""
         self._consecutive_failures += 1
 
-        # Calculate new interval
-        self._current_interval = min(
+        # Calculate new interval (jittered to avoid retrying in lockstep)
+        delay = min(
             self._min_interval * (self._backoff_multiplier**self._consecutive_failures),
             self._max_interval,
         )
+        self._current_interval = random.uniform(delay * 0.5, delay)
 
         logger.warning(
-            f"Device polling failed (attempt {self._consecutive_failures}): {error}. "
-            f"Retrying in {self._current_interval:.1f}s"
+            "Device polling failed (attempt {}): {}. Retrying in {:.1f}s",
+            self._consecutive_failures,
+            error,
+            self._current_interval,
         )
 
     # WiFi Connection Methods
@@ -590,11 +893,8 @@ class DeviceManager:
         Returns:
             Tuple of (success, message, wifi_device_id)
         """
-        from phone_agent.adb.connection import ADBConnection, ConnectionType
 
-        from AutoGLM_GUI.adb_plus import get_wifi_ip
-
-        conn = ADBConnection(adb_path=self._adb_path)
+        conn = self._adb_conn
 
         # Get device info
         device_info = conn.get_device_info(device_id)
@@ -625,7 +925,7 @@ class DeviceManager:
         if not ok:
             return (False, msg or "Failed to connect over WiFi", None)
 
-        logger.info(f"Successfully switched device {device_id} to WiFi: {address}")
+        logger.info("Successfully switched device {} to WiFi: {}", device_id, address)
         return (True, "Switched to WiFi successfully", address)
 
     def disconnect_wifi(self, device_id: str) -> tuple[bool, str]:
@@ -637,15 +937,13 @@ class DeviceManager:
         Returns:
             Tuple of (success, message)
         """
-        from phone_agent.adb.connection import ADBConnection
-
-        conn = ADBConnection(adb_path=self._adb_path)
+        conn = self._adb_conn
         ok, msg = conn.disconnect(device_id)
 
         if ok:
-            logger.info(f"Successfully disconnected WiFi device: {device_id}")
+            logger.info("Successfully disconnected WiFi device: {}", device_id)
         else:
-            logger.warning(f"Failed to disconnect WiFi device {device_id}: {msg}")
+            logger.warning("Failed to disconnect WiFi device {}: {}", device_id, msg)
 
         return (ok, msg)
 
@@ -655,26 +953,13 @@ class DeviceManager:
         """Manually connect to WiFi device (without USB).
 
         Args:
-            ip: Device IP address
+            ip: Device IP address (validated by WiFiManualConnectRequest)
             port: TCP port (1-65535)
 
         Returns:
             Tuple of (success, message, device_id)
         """
-        import re
-
-        from phone_agent.adb.connection import ADBConnection
-
-        # IP format validation
-        ip_pattern = r"^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$"
-        if not re.match(ip_pattern, ip):
-            return (False, "Invalid IP address format", None)
-
-        # Port range validation
-        if not (1 <= port <= 65535):
-            return (False, "Port must be between 1 and 65535", None)
-
-        conn = ADBConnection(adb_path=self._adb_path)
+        conn = self._adb_conn
         address = f"{ip}:{port}"
 
         # Direct connect
@@ -682,7 +967,7 @@ class DeviceManager:
         if not ok:
             return (False, msg or f"Failed to connect to {address}", None)
 
-        logger.info(f"Successfully connected to WiFi device manually: {address}")
+        logger.info("Successfully connected to WiFi device manually: {}", address)
         return (True, f"Successfully connected to {address}", address)
 
     def pair_wifi(
@@ -691,7 +976,7 @@ class DeviceManager:
         """Pair and connect to WiFi device using wireless debugging (Android 11+).
 
         Args:
-            ip: Device IP address
+            ip: Device IP address (validated by WiFiPairRequest)
             pairing_port: Wireless debugging pairing port (1-65535)
             pairing_code: 6-digit pairing code
             connection_port: Wireless debugging connection port (1-65535)
@@ -699,30 +984,8 @@ class DeviceManager:
         Returns:
             Tuple of (success, message, device_id)
         """
-        import re
 
-        from phone_agent.adb.connection import ADBConnection
-
-        from AutoGLM_GUI.adb_plus import pair_device
-
-        # IP format validation
-        ip_pattern = r"^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$"
-        if not re.match(ip_pattern, ip):
-            return (False, "Invalid IP address format", None)
-
-        # Pairing port validation
-        if not (1 <= pairing_port <= 65535):
-            return (False, "Pairing port must be between 1 and 65535", None)
-
-        # Connection port validation
-        if not (1 <= connection_port <= 65535):
-            return (False, "Connection port must be between 1 and 65535", None)
-
-        # Pairing code validation (6 digits)
-        if not pairing_code.isdigit() or len(pairing_code) != 6:
-            return (False, "Pairing code must be 6 digits", None)
-
-        conn = ADBConnection(adb_path=self._adb_path)
+        conn = self._adb_conn
 
         # Step 1: Pair device
         ok, msg = pair_device(
@@ -733,7 +996,9 @@ class DeviceManager:
         )
 
         if not ok:
-            logger.warning(f"Failed to pair WiFi device {ip}:{pairing_port}: {msg}")
+            logger.warning(
+                "Failed to pair WiFi device {}:{}: {}", ip, pairing_port, msg
+            )
             return (False, msg, None)
 
         # Step 2: Connect to device
@@ -742,7 +1007,9 @@ class DeviceManager:
 
         if not ok:
             logger.warning(
-                f"Paired successfully but connection failed to {connection_address}: {connect_msg}"
+                "Paired successfully but connection failed to {}: {}",
+                connection_address,
+                connect_msg,
             )
             return (
                 False,
@@ -751,7 +1018,7 @@ class DeviceManager:
             )
 
         logger.info(
-            f"Successfully paired and connected to WiFi device: {connection_address}"
+            "Successfully paired and connected to WiFi device: {}", connection_address
         )
         return (
             True,
@@ -2,24 +2,27 @@
 
 from __future__ import annotations
 
+import itertools
 import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import Callable, Optional
 
+from AutoGLM_GUI.config import config
+from AutoGLM_GUI.config_manager import config_manager
+from AutoGLM_GUI.device_manager import DeviceManager
 from AutoGLM_GUI.exceptions import (
     AgentInitializationError,
     AgentNotInitializedError,
     DeviceBusyError,
 )
 from AutoGLM_GUI.logger import logger
-
-if TYPE_CHECKING:
-    from phone_agent import PhoneAgent
-    from phone_agent.agent import AgentConfig
-    from phone_agent.model import ModelConfig
+from AutoGLM_GUI.state import agent_configs, agents, non_blocking_takeover
+from phone_agent import PhoneAgent
+from phone_agent.agent import AgentConfig
+from phone_agent.model import ModelConfig
 
 
 class AgentState(str, Enum):
@@ -31,20 +34,24 @@ class AgentState(str, Enum):
     INITIALIZING = "initializing"  # Agent being created
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMetadata:
-    """Metadata for a PhoneAgent instance."""
+    """Metadata for a PhoneAgent instance.
+
+    state / last_used 在 acquire_device / release_device 中由设备锁保护，
+    不经过 manager lock；其余字段仍由 manager lock 保护。
+    """
 
     device_id: str
     state: AgentState
     model_config: ModelConfig
     agent_config: AgentConfig
-    created_at: float
-    last_used: float
+    created_at: float  # Unix 时间戳（API 与 metrics 直接输出，需为墙钟时间）
+    last_used: float  # Unix 时间戳
     error_message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamingAgentContext:
     """Streaming agent 会话上下文."""
 
@@ -82,8 +89,7 @@ class PhoneAgentManager:
         >>>     result = agent.run("Open WeChat")
     """
 
-    _instance: Optional[PhoneAgentManager] = None
-    _instance_lock = threading.Lock()
+    _instance: PhoneAgentManager  # 模块导入时创建，见文件末尾
 
     def __init__(self):
         """Private constructor. Use get_instance() instead."""
@@ -92,14 +98,12 @@ class PhoneAgentManager:
 
         # Device-level locks (per-device concurrency control)
         self._device_locks: dict[str, threading.Lock] = {}
-        self._device_locks_lock = threading.Lock()
+        # 当前被持有的设备锁（release_device 释放的正是 acquire 拿到的那把）
+        self._held_locks: dict[str, threading.Lock] = {}
 
         # Agent metadata (indexed by device_id)
         self._metadata: dict[str, AgentMetadata] = {}
 
-        # State tracking
-        self._states: dict[str, AgentState] = {}
-
         # Streaming agent state (device_id -> StreamingAgentContext)
         self._streaming_contexts: dict[str, StreamingAgentContext] = {}
         self._streaming_contexts_lock = threading.Lock()
@@ -107,14 +111,18 @@ class PhoneAgentManager:
         # Abort events (device_id -> threading.Event)
         self._abort_events: dict[str, threading.Event] = {}
 
+        # Metadata version (bumped on any change visible via get_metadata)
+        # itertools.count 的 next() 是原子的，因此不持 manager lock 也能安全递增
+        self._version_seq = itertools.count(1)
+        self._version = 0
+
     @classmethod
     def get_instance(cls) -> PhoneAgentManager:
-        """Get singleton instance (thread-safe, double-checked locking)."""
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    cls._instance = cls()
-                    logger.info("PhoneAgentManager singleton created")
+        """Get singleton instance.
+
+        The instance is created eagerly at import (__init__ only allocates
+        empty containers), so this is a plain attribute read with no lock.
+        """
         return cls._instance
 
     # ==================== Agent Lifecycle ====================
@@ -148,15 +156,12 @@ class PhoneAgentManager:
             - On failure, state is rolled back
             - state.agents and state.agent_configs remain consistent
         """
-        from phone_agent import PhoneAgent
-
-        from AutoGLM_GUI.state import agent_configs, agents, non_blocking_takeover
-
         with self._manager_lock:
             # Check if already initialized
-            if device_id in agents and not force:
+            existing = agents.get(device_id)
+            if existing is not None and not force:
                 logger.debug(f"Agent already initialized for {device_id}")
-                return agents[device_id]
+                return existing
 
             # Check device availability (non-blocking check)
             device_lock = self._get_device_lock(device_id)
@@ -165,8 +170,7 @@ class PhoneAgentManager:
                     f"Device {device_id} is currently processing a request"
                 )
 
-            # Set initializing state
-            self._states[device_id] = AgentState.INITIALIZING
+            self._prune_failed_agents()
 
             try:
                 # Create agent
@@ -181,15 +185,16 @@ class PhoneAgentManager:
                 agent_configs[device_id] = (model_config, agent_config)
 
                 # Update metadata
+                now = time.time()
                 self._metadata[device_id] = AgentMetadata(
                     device_id=device_id,
                     state=AgentState.IDLE,
                     model_config=model_config,
                     agent_config=agent_config,
-                    created_at=time.time(),
-                    last_used=time.time(),
+                    created_at=now,
+                    last_used=now,
                 )
-                self._states[device_id] = AgentState.IDLE
+                self._bump_version()
 
                 logger.info(f"Agent initialized for device {device_id}")
                 return agent
@@ -198,8 +203,20 @@ class PhoneAgentManager:
                 # Rollback on error
                 agents.pop(device_id, None)
                 agent_configs.pop(device_id, None)
-                self._metadata.pop(device_id, None)
-                self._states[device_id] = AgentState.ERROR
+                # 保留一条 ERROR 记录（时间戳为失败时间），让 get_state / metrics
+                # 能看到失败的初始化；成功重试时被覆盖，设备消失后在下一次
+                # initialize_agent / destroy_agent 时由 _prune_failed_agents 清理
+                failed_at = time.time()
+                self._metadata[device_id] = AgentMetadata(
+                    device_id=device_id,
+                    state=AgentState.ERROR,
+                    model_config=model_config,
+                    agent_config=agent_config,
+                    created_at=failed_at,
+                    last_used=failed_at,
+                    error_message=str(e),
+                )
+                self._bump_version()
 
                 logger.error(f"Failed to initialize agent for {device_id}: {e}")
                 raise AgentInitializationError(
@@ -223,10 +240,6 @@ class PhoneAgentManager:
         Returns:
             已 patch 的 PhoneAgent 实例
         """
-        from phone_agent import PhoneAgent
-
-        from AutoGLM_GUI.state import non_blocking_takeover
-
         # 创建 agent
         agent = PhoneAgent(
             model_config=model_config,
@@ -300,9 +313,11 @@ class PhoneAgentManager:
                 on_thinking_chunk=on_thinking_chunk,
             )
 
-            # 复制上下文（由于持有设备锁，线程安全）
-            streaming_agent._context = original_agent._context.copy()
+            # 共享上下文列表而非复制（由于持有设备锁，线程安全）：
+            # PhoneAgent.step 只追加/替换本轮新增的消息，不改动已有条目
+            streaming_agent._context = original_agent._context
             streaming_agent._step_count = original_agent._step_count
+            original_len = len(original_agent._context)
 
             # 注册 abort 事件
             with self._streaming_contexts_lock:
@@ -327,6 +342,12 @@ class PhoneAgentManager:
                     logger.debug(
                         f"Synchronized context back to original agent for {device_id}"
                     )
+            elif streaming_agent:
+                # 中止：丢弃本轮追加的消息。仍在运行的步骤可能继续写共享列表，
+                # 所以让原始 agent 换用截断后的副本，而不是原地截断
+                original_agent = self.get_agent_safe(device_id)
+                if original_agent:
+                    original_agent._context = original_agent._context[:original_len]
 
             # 清理 abort 事件注册
             with self._streaming_contexts_lock:
@@ -347,12 +368,6 @@ class PhoneAgentManager:
         Raises:
             AgentInitializationError: 如果配置不完整或初始化失败
         """
-        from phone_agent.agent import AgentConfig
-        from phone_agent.model import ModelConfig
-
-        from AutoGLM_GUI.config import config
-        from AutoGLM_GUI.config_manager import config_manager
-
         logger.info(f"Auto-initializing agent for device {device_id}...")
 
         # 热重载配置
@@ -395,13 +410,13 @@ class PhoneAgentManager:
         Raises:
             AgentInitializationError: If agent not initialized and auto-init fails
         """
-        from AutoGLM_GUI.state import agents
-
         with self._manager_lock:
-            if device_id not in agents:
+            agent = agents.get(device_id)
+            if agent is None:
                 # 自动初始化：使用全局配置
                 self._auto_initialize_agent(device_id)
-            return agents[device_id]
+                agent = agents[device_id]
+            return agent
 
     def get_agent_safe(self, device_id: str) -> Optional[PhoneAgent]:
         """
@@ -413,10 +428,9 @@ class PhoneAgentManager:
         Returns:
             PhoneAgent or None: Agent instance or None if not initialized
         """
-        from AutoGLM_GUI.state import agents
-
-        with self._manager_lock:
-            return agents.get(device_id)
+        # 单次 dict 读取在 GIL 下是原子的，只读访问器不再获取 manager 锁；
+        # 可能读到并发更新前后的值，对状态查询而言可以接受
+        return agents.get(device_id)
 
     def reset_agent(self, device_id: str) -> None:
         """
@@ -428,39 +442,49 @@ class PhoneAgentManager:
         Raises:
             AgentNotInitializedError: If agent not initialized
         """
-        from phone_agent import PhoneAgent
-
-        from AutoGLM_GUI.state import agent_configs, agents, non_blocking_takeover
-
         with self._manager_lock:
-            if device_id not in agents:
+            agent = agents.get(device_id)
+            if agent is None:
                 raise AgentNotInitializedError(
                     f"Agent not initialized for device {device_id}"
                 )
 
             # Get cached config
-            if device_id not in agent_configs:
+            cached = agent_configs.get(device_id)
+            if cached is None:
                 logger.warning(
                     f"No cached config for {device_id}, only resetting agent state"
                 )
-                agents[device_id].reset()
+                agent.reset()
                 return
 
             # Rebuild agent from cached config
-            model_config, agent_config = agent_configs[device_id]
-
-            agents[device_id] = PhoneAgent(
-                model_config=model_config,
-                agent_config=agent_config,
-                takeover_callback=non_blocking_takeover,
-            )
+            model_config, agent_config = cached
+
+            if (
+                agent.model_config is model_config
+                and agent.agent_config is agent_config
+                and agent.action_handler.takeover_callback is non_blocking_takeover
+                and not self._get_device_lock(device_id).locked()
+            ):
+                # 配置未变且没有任务在跑：PhoneAgent 的会话状态只有
+                # _context/_step_count，原地 reset 即可，省去重建 OpenAI 客户端。
+                # 设备锁被持有时仍换新对象，避免清空运行中任务的上下文
+                agent.reset()
+            else:
+                agents[device_id] = PhoneAgent(
+                    model_config=model_config,
+                    agent_config=agent_config,
+                    takeover_callback=non_blocking_takeover,
+                )
 
             # Update metadata
-            if device_id in self._metadata:
-                self._metadata[device_id].last_used = time.time()
-                self._metadata[device_id].error_message = None
-
-            self._states[device_id] = AgentState.IDLE
+            meta = self._metadata.get(device_id)
+            if meta:
+                meta.state = AgentState.IDLE
+                meta.last_used = time.time()
+                meta.error_message = None
+                self._bump_version()
 
             logger.info(f"Agent reset for device {device_id}")
 
@@ -471,8 +495,6 @@ class PhoneAgentManager:
         Args:
             device_id: Device identifier
         """
-        from AutoGLM_GUI.state import agent_configs, agents
-
         with self._manager_lock:
             # Remove agent
             agent = agents.pop(device_id, None)
@@ -485,24 +507,47 @@ class PhoneAgentManager:
             # Remove config
             agent_configs.pop(device_id, None)
 
-            # Remove metadata
+            # Remove metadata (and failure records of devices that are gone)
             self._metadata.pop(device_id, None)
-            self._states.pop(device_id, None)
+            self._prune_failed_agents()
+            self._bump_version()
+
+            # Remove device lock, but only while holding it ourselves: an
+            # acquirer that fetched this lock earlier re-checks the map after
+            # acquiring and retries on the current lock
+            lock = self._device_locks.get(device_id)
+            if lock is not None and lock.acquire(blocking=False):
+                self._device_locks.pop(device_id, None)
+                lock.release()
 
             logger.info(f"Agent destroyed for device {device_id}")
 
+    def _prune_failed_agents(self) -> None:
+        """Drop failed-initialization records for devices that are gone.
+
+        A failed init leaves only an ERROR metadata entry (no agent); once the
+        device no longer resolves in DeviceManager, nothing can retry it.
+        Caller must hold ``_manager_lock`` and bump the version.
+        """
+        device_manager = DeviceManager.get_instance()
+        stale = [
+            device_id
+            for device_id in self._metadata
+            if device_id not in agents
+            and device_manager.get_device_by_device_id(device_id) is None
+        ]
+        for device_id in stale:
+            del self._metadata[device_id]
+
     def is_initialized(self, device_id: str) -> bool:
         """Check if agent is initialized for device."""
-        from AutoGLM_GUI.state import agents
-
-        with self._manager_lock:
-            return device_id in agents
+        return device_id in agents
 
     # ==================== Concurrency Control ====================
 
     def _get_device_lock(self, device_id: str) -> threading.Lock:
         """
-        Get or create device lock (double-checked locking pattern).
+        Get or create device lock.
 
         Args:
             device_id: Device identifier
@@ -511,15 +556,13 @@ class PhoneAgentManager:
             threading.Lock: Device-specific lock
         """
         # Fast path: lock already exists
-        if device_id in self._device_locks:
-            return self._device_locks[device_id]
+        lock = self._device_locks.get(device_id)
+        if lock is not None:
+            return lock
 
-        # Slow path: create lock
-        with self._device_locks_lock:
-            # Double-check inside lock
-            if device_id not in self._device_locks:
-                self._device_locks[device_id] = threading.Lock()
-            return self._device_locks[device_id]
+        # Slow path: dict.setdefault 对内置 dict 是原子的（CPython 保证），
+        # 并发创建时只有一个 Lock 胜出，其余被丢弃
+        return self._device_locks.setdefault(device_id, threading.Lock())
 
     def acquire_device(
         self,
@@ -542,31 +585,33 @@ class PhoneAgentManager:
             DeviceBusyError: If timeout and raise_on_timeout=True
             AgentNotInitializedError: If agent not initialized
         """
-        # Verify agent exists
-        if not self.is_initialized(device_id):
+        # Verify agent exists (直接查 dict，不经 is_initialized 方法调用)
+        if device_id not in agents:
             raise AgentNotInitializedError(
                 f"Agent not initialized for device {device_id}"
             )
 
-        lock = self._get_device_lock(device_id)
+        while True:
+            lock = self._get_device_lock(device_id)
 
-        # Try to acquire with timeout
-        if timeout is None:
-            # Blocking mode
-            acquired = lock.acquire(blocking=True)
-        elif timeout == 0:
-            # Non-blocking mode
-            acquired = lock.acquire(blocking=False)
-        else:
-            # Timeout mode
-            acquired = lock.acquire(blocking=True, timeout=timeout)
+            # Try to acquire: None = blocking (-1), 0 = non-blocking, >0 = timeout
+            acquired = lock.acquire(timeout=-1 if timeout is None else timeout)
+            if not acquired or self._device_locks.get(device_id) is lock:
+                break
+
+            # destroy_agent dropped this lock while we waited on it
+            lock.release()
 
         if acquired:
-            # Update state
-            with self._manager_lock:
-                self._states[device_id] = AgentState.BUSY
-                if device_id in self._metadata:
-                    self._metadata[device_id].last_used = time.time()
+            self._held_locks[device_id] = lock
+
+            # Update state (protected by the device lock we now hold).
+            # 获取锁后再查 metadata：阻塞等待期间 agent 可能被重新初始化
+            meta = self._metadata.get(device_id)
+            if meta:
+                meta.state = AgentState.BUSY
+                meta.last_used = time.time()
+                self._bump_version()
 
             logger.debug(f"Device lock acquired for {device_id}")
             return True
@@ -585,16 +630,21 @@ class PhoneAgentManager:
         Args:
             device_id: Device identifier
         """
-        lock = self._get_device_lock(device_id)
+        lock = self._held_locks.pop(device_id, None)
+        if lock is None:
+            # Double release is tolerated
+            return
 
-        if lock.locked():
-            lock.release()
+        # Update state before releasing, while the device lock still
+        # serializes writers
+        meta = self._metadata.get(device_id)
+        if meta:
+            meta.state = AgentState.IDLE
+            self._bump_version()
 
-            # Update state
-            with self._manager_lock:
-                self._states[device_id] = AgentState.IDLE
+        lock.release()
 
-            logger.debug(f"Device lock released for {device_id}")
+        logger.debug(f"Device lock released for {device_id}")
 
     @contextmanager
     def use_agent(self, device_id: str, timeout: Optional[float] = None):
@@ -634,15 +684,17 @@ class PhoneAgentManager:
 
     def get_state(self, device_id: str) -> AgentState:
         """Get current agent state."""
-        with self._manager_lock:
-            return self._states.get(device_id, AgentState.ERROR)
+        meta = self._metadata.get(device_id)
+        return meta.state if meta else AgentState.ERROR
 
     def set_error_state(self, device_id: str, error_message: str) -> None:
         """Mark agent as errored."""
         with self._manager_lock:
-            self._states[device_id] = AgentState.ERROR
-            if device_id in self._metadata:
-                self._metadata[device_id].error_message = error_message
+            meta = self._metadata.get(device_id)
+            if meta:
+                meta.state = AgentState.ERROR
+                meta.error_message = error_message
+                self._bump_version()
 
             logger.error(f"Agent error for {device_id}: {error_message}")
 
@@ -650,14 +702,12 @@ class PhoneAgentManager:
 
     def get_config(self, device_id: str) -> tuple[ModelConfig, AgentConfig]:
         """Get cached configuration for device."""
-        from AutoGLM_GUI.state import agent_configs
-
-        with self._manager_lock:
-            if device_id not in agent_configs:
-                raise AgentNotInitializedError(
-                    f"No configuration found for device {device_id}"
-                )
-            return agent_configs[device_id]
+        cached = agent_configs.get(device_id)
+        if cached is None:
+            raise AgentNotInitializedError(
+                f"No configuration found for device {device_id}"
+            )
+        return cached
 
     def update_config(
         self,
@@ -673,8 +723,6 @@ class PhoneAgentManager:
             model_config: New model config (None = keep existing)
             agent_config: New agent config (None = keep existing)
         """
-        from AutoGLM_GUI.state import agent_configs
-
         with self._manager_lock:
             if device_id not in agent_configs:
                 raise AgentNotInitializedError(
@@ -706,8 +754,9 @@ class PhoneAgentManager:
         Returns:
             Optional[str]: device_id of initialized agent, or None
         """
-        from AutoGLM_GUI.device_manager import DeviceManager
-        from AutoGLM_GUI.state import agents
+        # 设备列表接口对每台设备都会调用；没有任何 Agent 时无需加锁和扫描连接
+        if not agents:
+            return None
 
         with self._manager_lock:
             # Get device by serial from DeviceManager
@@ -728,15 +777,20 @@ class PhoneAgentManager:
 
     def list_agents(self) -> list[str]:
         """Get list of all initialized device IDs."""
-        from AutoGLM_GUI.state import agents
+        # list(dict) 在 C 层一次完成、不会释放 GIL，无需 manager 锁
+        return list(agents)
 
-        with self._manager_lock:
-            return list(agents.keys())
+    def _bump_version(self) -> None:
+        self._version = next(self._version_seq)
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever agent metadata changes."""
+        return self._version
 
     def get_metadata(self, device_id: str) -> Optional[AgentMetadata]:
         """Get agent metadata."""
-        with self._manager_lock:
-            return self._metadata.get(device_id)
+        return self._metadata.get(device_id)
 
     def abort_streaming_chat(self, device_id: str) -> bool:
         """
@@ -759,5 +813,7 @@ class PhoneAgentManager:
 
     def is_streaming_active(self, device_id: str) -> bool:
         """检查设备是否有活跃的流式会话."""
-        with self._streaming_contexts_lock:
-            return device_id in self._abort_events
+        return device_id in self._abort_events
+
+
+PhoneAgentManager._instance = PhoneAgentManager()
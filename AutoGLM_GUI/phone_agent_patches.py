@@ -4,6 +4,7 @@ Monkey patches for phone_agent to add streaming functionality.
 This module patches the upstream phone_agent code without modifying the original files.
 """
 
+import sys
 from typing import Any, Callable
 
 from phone_agent.model import ModelClient
@@ -27,8 +28,12 @@ def _patched_model_request(
 
     from phone_agent.model.client import ModelResponse
 
+    # 仅在交互式终端逐块 flush；输出被重定向（如 Electron 子进程）时依赖缓冲，
+    # 避免每个 token 一次 write 系统调用
+    flush_chunks = sys.stdout.isatty()
+
     # Start timing
-    start_time = time.time()
+    start_time = time.perf_counter()
     time_to_first_token = None
     time_to_thinking_end = None
 
@@ -58,7 +63,7 @@ def _patched_model_request(
 
             # Record time to first token
             if not first_token_received:
-                time_to_first_token = time.time() - start_time
+                time_to_first_token = time.perf_counter() - start_time
                 first_token_received = True
 
             if in_action_phase:
@@ -73,7 +78,7 @@ def _patched_model_request(
                 if marker in buffer:
                     # Marker found, print everything before it
                     thinking_part = buffer.split(marker, 1)[0]
-                    print(thinking_part, end="", flush=True)
+                    print(thinking_part, end="", flush=flush_chunks)
                     if on_thinking_chunk:
                         on_thinking_chunk(thinking_part)
                     print()  # Print newline after thinking is complete
@@ -82,7 +87,7 @@ def _patched_model_request(
 
                     # Record time to thinking end
                     if time_to_thinking_end is None:
-                        time_to_thinking_end = time.time() - start_time
+                        time_to_thinking_end = time.perf_counter() - start_time
 
                     break
 
@@ -102,13 +107,13 @@ def _patched_model_request(
 
             if not is_potential_marker:
                 # Safe to print the buffer
-                print(buffer, end="", flush=True)
+                print(buffer, end="", flush=flush_chunks)
                 if on_thinking_chunk:
                     on_thinking_chunk(buffer)
                 buffer = ""
 
     # Calculate total time
-    total_time = time.time() - start_time
+    total_time = time.perf_counter() - start_time
 
     # Parse thinking and action from response
     thinking, action = self._parse_response(raw_content)
@@ -128,7 +133,7 @@ def _patched_model_request(
             f"{get_message('time_to_thinking_end', lang)}:        {time_to_thinking_end:.3f}s"
         )
     print(f"{get_message('total_inference_time', lang)}:          {total_time:.3f}s")
-    print("=" * 50)
+    print("=" * 50, flush=True)
 
     return ModelResponse(
         thinking=thinking,
@@ -5,10 +5,13 @@ import platform
 import subprocess
 from typing import Any, Sequence
 
+# The OS can't change at runtime; resolve it once instead of per subprocess call
+_IS_WINDOWS = platform.system() == "Windows"
+
 
 def is_windows() -> bool:
     """Return True if running on Windows."""
-    return platform.system() == "Windows"
+    return _IS_WINDOWS
 
 
 def run_cmd_silently_sync(
@@ -1,8 +1,40 @@
 """Shared Pydantic models for the AutoGLM-GUI API."""
 
-import re
-
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated
+
+from pydantic import BaseModel, Field, StringConstraints, field_validator
+
+# 以下约束由 pydantic-core（Rust）在请求解析阶段执行，非法参数直接返回 422
+Port = Annotated[int, Field(ge=1, le=65535)]
+IPv4Str = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        pattern=r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$",
+    ),
+]
+PairingCode = Annotated[
+    str, StringConstraints(strip_whitespace=True, pattern=r"^\d{6}$")
+]
+# 触控类请求（手势流高频调用）：坐标上限取合理的最大屏幕尺寸
+Coordinate = Annotated[int, Field(ge=0, le=10000)]
+DurationMs = Annotated[int, Field(ge=0, le=10000)]  # 最大 10 秒
+Delay = Annotated[float, Field(ge=0.0, le=60.0)]  # 最大等待 60 秒
+
+
+def _require_text(v: str, name: str) -> str:
+    """Strip a string field once and reject it if nothing is left."""
+    stripped = v.strip()
+    if not stripped:
+        raise ValueError(f"{name} cannot be empty")
+    return stripped
+
+
+def _check_http_url(v: str) -> str:
+    """Reject base URLs that are not HTTP(S) (v must already be stripped)."""
+    if not v.startswith(("http://", "https://")):
+        raise ValueError("base_url must start with http:// or https://")
+    return v
 
 
 class APIModelConfig(BaseModel):
@@ -24,9 +56,7 @@ class APIModelConfig(BaseModel):
         if not v:
             return None
         # 检查是否是有效的 HTTP/HTTPS URL
-        if not re.match(r"^https?://", v):
-            raise ValueError("base_url must start with http:// or https://")
-        return v
+        return _check_http_url(v)
 
 
 class APIAgentConfig(BaseModel):
@@ -69,11 +99,10 @@ class ChatRequest(BaseModel):
     @classmethod
     def validate_message(cls, v: str) -> str:
         """验证 message 非空."""
-        if not v or not v.strip():
-            raise ValueError("message cannot be empty")
+        message = _require_text(v, "message")
         if len(v) > 10000:
             raise ValueError("message too long (max 10000 characters)")
-        return v.strip()
+        return message
 
 
 class ChatResponse(BaseModel):
@@ -88,6 +117,15 @@ class StatusResponse(BaseModel):
     step_count: int
 
 
+class SimpleOpResponse(BaseModel):
+    """通用操作结果（init / reset / 配置保存与删除）。"""
+
+    success: bool
+    message: str
+    device_id: str | None = None
+    warnings: list[str] | None = None
+
+
 class ResetRequest(BaseModel):
     device_id: str  # 设备 ID（必填）
 
@@ -112,30 +150,10 @@ class ScreenshotResponse(BaseModel):
 
 
 class TapRequest(BaseModel):
-    x: int
-    y: int
+    x: Coordinate
+    y: Coordinate
     device_id: str | None = None
-    delay: float = 0.0
-
-    @field_validator("x", "y")
-    @classmethod
-    def validate_coordinates(cls, v: int) -> int:
-        """验证坐标范围."""
-        if v < 0:
-            raise ValueError("coordinates must be non-negative")
-        if v > 10000:  # 合理的最大屏幕尺寸
-            raise ValueError("coordinates must be <= 10000")
-        return v
-
-    @field_validator("delay")
-    @classmethod
-    def validate_delay(cls, v: float) -> float:
-        """验证 delay 范围."""
-        if v < 0.0:
-            raise ValueError("delay must be non-negative")
-        if v > 60.0:  # 最大等待 60 秒
-            raise ValueError("delay must be <= 60.0 seconds")
-        return v
+    delay: Delay = 0.0
 
 
 class TapResponse(BaseModel):
@@ -144,44 +162,13 @@ class TapResponse(BaseModel):
 
 
 class SwipeRequest(BaseModel):
-    start_x: int
-    start_y: int
-    end_x: int
-    end_y: int
-    duration_ms: int | None = None
+    start_x: Coordinate
+    start_y: Coordinate
+    end_x: Coordinate
+    end_y: Coordinate
+    duration_ms: DurationMs | None = None
     device_id: str | None = None
-    delay: float = 0.0
-
-    @field_validator("start_x", "start_y", "end_x", "end_y")
-    @classmethod
-    def validate_coordinates(cls, v: int) -> int:
-        """验证坐标范围."""
-        if v < 0:
-            raise ValueError("coordinates must be non-negative")
-        if v > 10000:
-            raise ValueError("coordinates must be <= 10000")
-        return v
-
-    @field_validator("duration_ms")
-    @classmethod
-    def validate_duration(cls, v: int | None) -> int | None:
-        """验证滑动持续时间."""
-        if v is not None:
-            if v < 0:
-                raise ValueError("duration_ms must be non-negative")
-            if v > 10000:  # 最大 10 秒
-                raise ValueError("duration_ms must be <= 10000")
-        return v
-
-    @field_validator("delay")
-    @classmethod
-    def validate_delay(cls, v: float) -> float:
-        """验证 delay 范围."""
-        if v < 0.0:
-            raise ValueError("delay must be non-negative")
-        if v > 60.0:
-            raise ValueError("delay must be <= 60.0 seconds")
-        return v
+    delay: Delay = 0.0
 
 
 class SwipeResponse(BaseModel):
@@ -190,30 +177,10 @@ class SwipeResponse(BaseModel):
 
 
 class TouchDownRequest(BaseModel):
-    x: int
-    y: int
+    x: Coordinate
+    y: Coordinate
     device_id: str | None = None
-    delay: float = 0.0
-
-    @field_validator("x", "y")
-    @classmethod
-    def validate_coordinates(cls, v: int) -> int:
-        """验证坐标范围."""
-        if v < 0:
-            raise ValueError("coordinates must be non-negative")
-        if v > 10000:
-            raise ValueError("coordinates must be <= 10000")
-        return v
-
-    @field_validator("delay")
-    @classmethod
-    def validate_delay(cls, v: float) -> float:
-        """验证 delay 范围."""
-        if v < 0.0:
-            raise ValueError("delay must be non-negative")
-        if v > 60.0:
-            raise ValueError("delay must be <= 60.0 seconds")
-        return v
+    delay: Delay = 0.0
 
 
 class TouchDownResponse(BaseModel):
@@ -222,30 +189,10 @@ class TouchDownResponse(BaseModel):
 
 
 class TouchMoveRequest(BaseModel):
-    x: int
-    y: int
+    x: Coordinate
+    y: Coordinate
     device_id: str | None = None
-    delay: float = 0.0
-
-    @field_validator("x", "y")
-    @classmethod
-    def validate_coordinates(cls, v: int) -> int:
-        """验证坐标范围."""
-        if v < 0:
-            raise ValueError("coordinates must be non-negative")
-        if v > 10000:
-            raise ValueError("coordinates must be <= 10000")
-        return v
-
-    @field_validator("delay")
-    @classmethod
-    def validate_delay(cls, v: float) -> float:
-        """验证 delay 范围."""
-        if v < 0.0:
-            raise ValueError("delay must be non-negative")
-        if v > 60.0:
-            raise ValueError("delay must be <= 60.0 seconds")
-        return v
+    delay: Delay = 0.0
 
 
 class TouchMoveResponse(BaseModel):
@@ -254,30 +201,10 @@ class TouchMoveResponse(BaseModel):
 
 
 class TouchUpRequest(BaseModel):
-    x: int
-    y: int
+    x: Coordinate
+    y: Coordinate
     device_id: str | None = None
-    delay: float = 0.0
-
-    @field_validator("x", "y")
-    @classmethod
-    def validate_coordinates(cls, v: int) -> int:
-        """验证坐标范围."""
-        if v < 0:
-            raise ValueError("coordinates must be non-negative")
-        if v > 10000:
-            raise ValueError("coordinates must be <= 10000")
-        return v
-
-    @field_validator("delay")
-    @classmethod
-    def validate_delay(cls, v: float) -> float:
-        """验证 delay 范围."""
-        if v < 0.0:
-            raise ValueError("delay must be non-negative")
-        if v > 60.0:
-            raise ValueError("delay must be <= 60.0 seconds")
-        return v
+    delay: Delay = 0.0
 
 
 class TouchUpResponse(BaseModel):
@@ -310,6 +237,7 @@ class DeviceResponse(BaseModel):
 
 class DeviceListResponse(BaseModel):
     devices: list[DeviceResponse]  # 从 list[dict] 改为强类型
+    stale: bool = False  # 轮询未运行时返回缓存列表，后台刷新中
 
 
 class ConfigResponse(BaseModel):
@@ -342,33 +270,18 @@ class ConfigSaveRequest(BaseModel):
     @classmethod
     def validate_base_url(cls, v: str) -> str:
         """验证 base_url 格式."""
-        v = v.strip()
-        if not v:
-            raise ValueError("base_url cannot be empty")
-        if not re.match(r"^https?://", v):
-            raise ValueError("base_url must start with http:// or https://")
-        return v
+        return _check_http_url(_require_text(v, "base_url"))
 
     @field_validator("model_name")
     @classmethod
     def validate_model_name(cls, v: str) -> str:
         """验证 model_name 非空."""
-        if not v or not v.strip():
-            raise ValueError("model_name cannot be empty")
-        return v.strip()
+        return _require_text(v, "model_name")
 
 
 class WiFiConnectRequest(BaseModel):
     device_id: str | None = None
-    port: int = 5555
-
-    @field_validator("port")
-    @classmethod
-    def validate_port(cls, v: int) -> int:
-        """验证端口范围."""
-        if v < 1 or v > 65535:
-            raise ValueError("port must be between 1 and 65535")
-        return v
+    port: Port = 5555
 
 
 class WiFiConnectResponse(BaseModel):
@@ -392,27 +305,8 @@ class WiFiDisconnectResponse(BaseModel):
 class WiFiManualConnectRequest(BaseModel):
     """手动连接 WiFi 请求 (无需 USB)."""
 
-    ip: str  # IP 地址
-    port: int = 5555  # 端口，默认 5555
-
-    @field_validator("ip")
-    @classmethod
-    def validate_ip(cls, v: str) -> str:
-        """验证 IP 地址格式."""
-        v = v.strip()
-        # 简单的 IPv4 格式验证
-        ip_pattern = r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$"
-        if not re.match(ip_pattern, v):
-            raise ValueError("invalid IPv4 address format")
-        return v
-
-    @field_validator("port")
-    @classmethod
-    def validate_port(cls, v: int) -> int:
-        """验证端口范围."""
-        if v < 1 or v > 65535:
-            raise ValueError("port must be between 1 and 65535")
-        return v
+    ip: IPv4Str  # IP 地址
+    port: Port = 5555  # 端口，默认 5555
 
 
 class WiFiManualConnectResponse(BaseModel):
@@ -427,37 +321,10 @@ class WiFiManualConnectResponse(BaseModel):
 class WiFiPairRequest(BaseModel):
     """WiFi pairing request (Android 11+ wireless debugging)."""
 
-    ip: str  # Device IP address
-    pairing_port: int  # Pairing port (from "Pair device with code" dialog)
-    pairing_code: str  # 6-digit pairing code
-    connection_port: int = 5555  # Standard ADB connection port (default 5555)
-
-    @field_validator("ip")
-    @classmethod
-    def validate_ip(cls, v: str) -> str:
-        """验证 IP 地址格式."""
-        v = v.strip()
-        ip_pattern = r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$"
-        if not re.match(ip_pattern, v):
-            raise ValueError("invalid IPv4 address format")
-        return v
-
-    @field_validator("pairing_port", "connection_port")
-    @classmethod
-    def validate_port(cls, v: int) -> int:
-        """验证端口范围."""
-        if v < 1 or v > 65535:
-            raise ValueError("port must be between 1 and 65535")
-        return v
-
-    @field_validator("pairing_code")
-    @classmethod
-    def validate_pairing_code(cls, v: str) -> str:
-        """验证配对码格式."""
-        v = v.strip()
-        if not re.match(r"^\d{6}$", v):
-            raise ValueError("pairing_code must be a 6-digit number")
-        return v
+    ip: IPv4Str  # Device IP address
+    pairing_port: Port  # Pairing port (from "Pair device with code" dialog)
+    pairing_code: PairingCode  # 6-digit pairing code
+    connection_port: Port = 5555  # Standard ADB connection port (default 5555)
 
 
 class WiFiPairResponse(BaseModel):
@@ -545,17 +412,13 @@ class WorkflowBase(BaseModel):
     @classmethod
     def validate_name(cls, v: str) -> str:
         """验证 name 非空."""
-        if not v or not v.strip():
-            raise ValueError("name cannot be empty")
-        return v.strip()
+        return _require_text(v, "name")
 
     @field_validator("text")
     @classmethod
     def validate_text(cls, v: str) -> str:
         """验证 text 非空."""
-        if not v or not v.strip():
-            raise ValueError("text cannot be empty")
-        return v.strip()
+        return _require_text(v, "text")
 
 
 class WorkflowCreate(WorkflowBase):
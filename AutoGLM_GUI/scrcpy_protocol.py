@@ -29,7 +29,7 @@ class ScrcpyVideoStreamMetadata:
     codec: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrcpyMediaStreamPacket:
     type: str
     data: bytes
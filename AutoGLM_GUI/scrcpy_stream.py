@@ -22,6 +22,9 @@ from AutoGLM_GUI.scrcpy_protocol import (
     ScrcpyVideoStreamOptions,
 )
 
+# Socket read size per worker-thread hop
+_RECV_SIZE = 64 * 1024
+
 
 @dataclass
 class ScrcpyServerOptions:
@@ -153,7 +156,8 @@ class ScrcpyStreamer:
             logger.info("Successfully connected!")
 
         except Exception as e:
-            logger.exception(f"Failed to start: {e}")
+            # 完整 traceback 由调用方记录（异常通过 from e 链接），这里不再重复格式化
+            logger.error("Failed to start: {}", e)
             self.stop()
             raise RuntimeError(f"Failed to start scrcpy server: {e}") from e
 
@@ -290,25 +294,33 @@ class ScrcpyStreamer:
         raise RuntimeError("Failed to start scrcpy server after maximum retries")
 
     async def _connect_socket(self) -> None:
-        """Connect to scrcpy TCP socket."""
-        self.tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.tcp_socket.settimeout(5)
+        """Connect to scrcpy TCP socket (exponential backoff, ~2.5s budget)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 2.5
+        delay = 0.05
 
-        try:
-            self.tcp_socket.setsockopt(
-                socket.SOL_SOCKET, socket.SO_RCVBUF, 2 * 1024 * 1024
-            )
-            logger.debug("Set socket receive buffer to 2MB")
-        except OSError as e:
-            logger.warning(f"Failed to set socket buffer size: {e}")
+        while True:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(5)
 
-        for _ in range(5):
             try:
-                self.tcp_socket.connect(("localhost", self.port))
-                self.tcp_socket.settimeout(None)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2 * 1024 * 1024)
+            except OSError as e:
+                logger.warning(f"Failed to set socket buffer size: {e}")
+
+            try:
+                sock.connect(("localhost", self.port))
+                sock.settimeout(None)
+                self.tcp_socket = sock
                 return
-            except (ConnectionRefusedError, OSError):
-                await asyncio.sleep(0.5)
+            except OSError:
+                # 连接失败的 socket 在部分平台上不可复用，每次重试新建
+                sock.close()
+
+            if loop.time() + delay > deadline:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.6, 1.0)
 
         raise ConnectionError("Failed to connect to scrcpy server")
 
@@ -316,18 +328,52 @@ class ScrcpyStreamer:
         if not self.tcp_socket:
             raise ConnectionError("Socket not connected")
 
-        while len(self._read_buffer) < size:
-            chunk = await asyncio.to_thread(
-                self.tcp_socket.recv, max(4096, size - len(self._read_buffer))
-            )
+        buf = self._read_buffer
+        if size - len(buf) >= _RECV_SIZE:
+            return await self._read_large(self.tcp_socket, size)
+
+        while len(buf) < size:
+            # 每次 recv 尽量多读，减少线程切换次数（包头读取通常直接命中缓冲）
+            chunk = await asyncio.to_thread(self.tcp_socket.recv, _RECV_SIZE)
             if not chunk:
                 raise ConnectionError("Socket closed by remote")
-            self._read_buffer.extend(chunk)
+            buf.extend(chunk)
+
+        if len(buf) == size:
+            data = bytes(buf)
+            buf.clear()
+            return data
 
-        data = bytes(self._read_buffer[:size])
-        del self._read_buffer[:size]
+        # memoryview 切片只拷贝一次；bytearray 头部删除为 O(1)
+        with memoryview(buf) as view:
+            data = bytes(view[:size])
+        del buf[:size]
         return data
 
+    async def _read_large(self, sock: socket.socket, size: int) -> bytes:
+        """Read a large payload (e.g. a keyframe) straight into a presized buffer.
+
+        recv_into 写入预分配缓冲区，省去中间 chunk 的分配与拼接拷贝，
+        且整个读取在一次线程切换内完成。
+        """
+        out = bytearray(size)
+        buf = self._read_buffer
+        filled = len(buf)
+        out[:filled] = buf
+        buf.clear()
+
+        def recv_rest() -> None:
+            with memoryview(out) as view:
+                pos = filled
+                while pos < size:
+                    n = sock.recv_into(view[pos:])
+                    if not n:
+                        raise ConnectionError("Socket closed by remote")
+                    pos += n
+
+        await asyncio.to_thread(recv_rest)
+        return bytes(out)
+
     async def _read_u16(self) -> int:
         return int.from_bytes(await self._read_exactly(2), "big")
 
@@ -9,7 +9,10 @@ from typing import Any
 import socketio
 
 from AutoGLM_GUI.logger import logger
-from AutoGLM_GUI.scrcpy_protocol import ScrcpyMediaStreamPacket
+from AutoGLM_GUI.scrcpy_protocol import (
+    ScrcpyMediaStreamPacket,
+    ScrcpyVideoStreamMetadata,
+)
 from AutoGLM_GUI.scrcpy_stream import ScrcpyStreamer
 
 sio = socketio.AsyncServer(
@@ -17,51 +20,183 @@ sio = socketio.AsyncServer(
     cors_allowed_origins="*",
 )
 
-_socket_streamers: dict[str, ScrcpyStreamer] = {}
-_stream_tasks: dict[str, asyncio.Task] = {}
+# Max packets buffered between the scrcpy reader and the Socket.IO sender
+_PACKET_QUEUE_SIZE = 8
+
+# 客户端断开后 scrcpy 保持运行的时间（秒），期间同参数重连可跳过冷启动
+_IDLE_TTL_S = 30.0
+
+# (device_id, max_size, bit_rate)
+StreamKey = tuple[str | None, int, int]
+
+
+class _StreamSession:
+    """A running scrcpy streamer, its packet pump and the clients it feeds.
+
+    单一读取任务在 streamer 生命周期内持续运行，数据包一次编码后广播给所有订阅者。
+    新订阅者先进入等待集合，在下一个关键帧前补发缓存的编码配置后再加入广播；
+    没有订阅者时会话进入空闲状态，继续消费并丢弃数据包（避免 scrcpy 积压旧帧）。
+    """
+
+    def __init__(self, key: StreamKey, streamer: ScrcpyStreamer) -> None:
+        self.key = key
+        self.streamer = streamer
+        self.subscribers: set[str] = set()
+        self._pending: set[str] = set()
+        self._config_packet: ScrcpyMediaStreamPacket | None = None
+        self._idle_handle: asyncio.TimerHandle | None = None
+
+        # 读取与发送解耦：emit 等待网络发送时，下一包的 socket 读取可以并行进行
+        self._queue: asyncio.Queue[ScrcpyMediaStreamPacket | Exception] = asyncio.Queue(
+            maxsize=_PACKET_QUEUE_SIZE
+        )
+        self._reader = asyncio.create_task(_read_packets(streamer, self._queue))
+        self._sender = asyncio.create_task(self._send_loop())
+
+    @property
+    def idle(self) -> bool:
+        return not self.subscribers and not self._pending
+
+    def attach(self, sid: str) -> None:
+        """Add a client; its playback starts at the next keyframe."""
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        self._pending.add(sid)
+
+    def detach(self, sid: str) -> None:
+        """Remove a client; the last one out schedules shutdown after the idle TTL."""
+        self.subscribers.discard(sid)
+        self._pending.discard(sid)
+        if self.idle and self._idle_handle is None:
+            self._idle_handle = asyncio.get_running_loop().call_later(
+                _IDLE_TTL_S, _discard_session, self
+            )
+
+    def cancel(self) -> None:
+        """Stop the pump tasks and idle timer (the streamer keeps running)."""
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        self._reader.cancel()
+        self._sender.cancel()
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                item = await self._queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                await self._dispatch(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.exception("Video streaming failed: {}", exc)
+            targets = [*self.subscribers, *self._pending]
+            if targets:
+                try:
+                    await sio.emit("error", {"message": str(exc)}, to=targets)
+                except Exception:
+                    pass
+            _discard_session(self)
+
+    async def _dispatch(self, packet: ScrcpyMediaStreamPacket) -> None:
+        if packet.type == "configuration":
+            self._config_packet = packet
+        elif packet.keyframe and self._pending:
+            # 等待中的订阅者从关键帧开始播放，先补发编码配置
+            joining = list(self._pending)
+            self._pending.clear()
+            if self._config_packet is not None:
+                await sio.emit(
+                    "video-data", _packet_to_payload(self._config_packet), to=joining
+                )
+            self.subscribers.update(joining)
+
+        if self.subscribers:
+            await sio.emit(
+                "video-data", _packet_to_payload(packet), to=list(self.subscribers)
+            )
+
+
+# sid → 正在观看的会话；StreamKey → 会话（含空闲会话）
+_sessions: dict[str, _StreamSession] = {}
+_streams: dict[StreamKey, _StreamSession] = {}
+# 每个 sid 一把锁，串行化同一客户端的 connect-device，避免并发启动时旧 streamer 泄漏
+_connect_locks: dict[str, asyncio.Lock] = {}
+
+
+def _unregister(session: _StreamSession) -> None:
+    for sid in [*session.subscribers, *session._pending]:
+        if _sessions.get(sid) is session:
+            del _sessions[sid]
+    if _streams.get(session.key) is session:
+        del _streams[session.key]
+
 
+# 后台拆除任务的强引用，防止任务在完成前被垃圾回收
+_discard_tasks: set[asyncio.Task] = set()
 
-async def _stop_stream_for_sid(sid: str) -> None:
-    task = _stream_tasks.pop(sid, None)
-    if task:
-        task.cancel()
 
-    streamer = _socket_streamers.pop(sid, None)
-    if streamer:
-        streamer.stop()
+def _discard_session(session: _StreamSession) -> None:
+    """Drop a session from the registries and stop it in the background.
 
+    Used from sync contexts (idle timer) and from the session's own send loop,
+    which session.cancel() would cancel mid-await, so the teardown runs as a
+    separate task and streamer.stop() stays off the event loop.
+    """
+    _unregister(session)
+    task = asyncio.get_running_loop().create_task(_discard_sessions([session]))
+    _discard_tasks.add(task)
+    task.add_done_callback(_on_discard_done)
 
-def stop_streamers(device_id: str | None = None) -> None:
+
+def _on_discard_done(task: asyncio.Task) -> None:
+    _discard_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error("Failed to stop scrcpy stream")
+
+
+async def _discard_sessions(sessions: list[_StreamSession]) -> None:
+    """Discard several sessions, stopping their scrcpy servers in parallel."""
+    for session in sessions:
+        _unregister(session)
+        session.cancel()
+    # streamer.stop() 会等待进程退出（最多 2s），放到线程中并行执行
+    await asyncio.gather(
+        *(asyncio.to_thread(session.streamer.stop) for session in sessions)
+    )
+
+
+def _release_sid(sid: str) -> None:
+    """Detach a client from its session (the session may stay warm)."""
+    session = _sessions.pop(sid, None)
+    if session is not None:
+        session.detach(sid)
+
+
+async def stop_streamers(device_id: str | None = None) -> None:
     """Stop active scrcpy streamers (all or by device)."""
-    sids = list(_socket_streamers.keys())
-    for sid in sids:
-        streamer = _socket_streamers.get(sid)
-        if not streamer:
-            continue
-        if device_id and streamer.device_id != device_id:
-            continue
-        task = _stream_tasks.pop(sid, None)
-        if task:
-            task.cancel()
-        streamer.stop()
-        _socket_streamers.pop(sid, None)
-
-
-async def _stream_packets(sid: str, streamer: ScrcpyStreamer) -> None:
+    # 先拍快照再统一注销，拆除过程中的 await 不会看到半更新的注册表
+    await _discard_sessions(
+        [
+            session
+            for session in _streams.values()
+            if not device_id or session.streamer.device_id == device_id
+        ]
+    )
+
+
+async def _read_packets(
+    streamer: ScrcpyStreamer,
+    queue: asyncio.Queue[ScrcpyMediaStreamPacket | Exception],
+) -> None:
+    """Reader side: pull packets from scrcpy into the queue (errors forwarded)."""
     try:
         async for packet in streamer.iter_packets():
-            payload = _packet_to_payload(packet)
-            await sio.emit("video-data", payload, to=sid)
-    except asyncio.CancelledError:
-        raise
+            await queue.put(packet)
     except Exception as exc:
-        logger.exception("Video streaming failed: %s", exc)
-        try:
-            await sio.emit("error", {"message": str(exc)}, to=sid)
-        except Exception:
-            pass
-    finally:
-        await _stop_stream_for_sid(sid)
+        await queue.put(exc)
 
 
 def _packet_to_payload(packet: ScrcpyMediaStreamPacket) -> dict[str, Any]:
@@ -76,15 +211,29 @@ def _packet_to_payload(packet: ScrcpyMediaStreamPacket) -> dict[str, Any]:
     return payload
 
 
+async def _emit_metadata(sid: str, metadata: ScrcpyVideoStreamMetadata) -> None:
+    await sio.emit(
+        "video-metadata",
+        {
+            "deviceName": metadata.device_name,
+            "width": metadata.width,
+            "height": metadata.height,
+            "codec": metadata.codec,
+        },
+        to=sid,
+    )
+
+
 @sio.event
 async def connect(sid: str, environ: dict) -> None:
-    logger.info("Socket.IO client connected: %s", sid)
+    logger.info("Socket.IO client connected: {}", sid)
 
 
 @sio.event
 async def disconnect(sid: str) -> None:
-    logger.info("Socket.IO client disconnected: %s", sid)
-    await _stop_stream_for_sid(sid)
+    logger.info("Socket.IO client disconnected: {}", sid)
+    _connect_locks.pop(sid, None)
+    _release_sid(sid)
 
 
 @sio.on("connect-device")
@@ -93,33 +242,47 @@ async def connect_device(sid: str, data: dict | None) -> None:
     device_id = payload.get("device_id") or payload.get("deviceId")
     max_size = int(payload.get("maxSize") or 1280)
     bit_rate = int(payload.get("bitRate") or 4_000_000)
+    key: StreamKey = (device_id, max_size, bit_rate)
 
-    await _stop_stream_for_sid(sid)
+    # setdefault 在单次调用内完成查找与插入，并发的 connect-device 拿到同一把锁
+    lock = _connect_locks.setdefault(sid, asyncio.Lock())
+    async with lock:
+        if _connect_locks.get(sid) is not lock:
+            # 排队等锁期间客户端已断开（disconnect 已执行 _release_sid）
+            return
+        _release_sid(sid)
 
-    streamer = ScrcpyStreamer(
-        device_id=device_id,
-        max_size=max_size,
-        bit_rate=bit_rate,
-    )
+        session = _streams.get(key)
+        if session is not None:
+            logger.info("Sharing scrcpy stream for device {}", device_id)
+            session.attach(sid)
+            _sessions[sid] = session
+            await _emit_metadata(sid, await session.streamer.read_video_metadata())
+            return
 
-    try:
-        await streamer.start()
-        metadata = await streamer.read_video_metadata()
-        await sio.emit(
-            "video-metadata",
-            {
-                "deviceName": metadata.device_name,
-                "width": metadata.width,
-                "height": metadata.height,
-                "codec": metadata.codec,
-            },
-            to=sid,
+        # 空闲会话占用同一个本地转发端口，冷启动前先释放
+        await _discard_sessions([s for s in _streams.values() if s.idle])
+
+        streamer = ScrcpyStreamer(
+            device_id=device_id,
+            max_size=max_size,
+            bit_rate=bit_rate,
         )
-    except Exception as exc:
-        streamer.stop()
-        logger.exception("Failed to start scrcpy stream: %s", exc)
-        await sio.emit("error", {"message": str(exc)}, to=sid)
-        return
+        try:
+            await streamer.start()
+            await _emit_metadata(sid, await streamer.read_video_metadata())
+        except Exception as exc:
+            await asyncio.to_thread(streamer.stop)
+            logger.exception("Failed to start scrcpy stream: {}", exc)
+            await sio.emit("error", {"message": str(exc)}, to=sid)
+            return
 
-    _socket_streamers[sid] = streamer
-    _stream_tasks[sid] = asyncio.create_task(_stream_packets(sid, streamer))
+        session = _StreamSession(key, streamer)
+        session.attach(sid)
+        _streams[key] = session
+        if _connect_locks.get(sid) is not lock:
+            # 客户端在启动期间已断开（disconnect 已执行过 _release_sid）：
+            # 立即 detach，会话按空闲 TTL 回收，而不是挂在已失效的 sid 上
+            session.detach(sid)
+            return
+        _sessions[sid] = session
@@ -21,6 +21,7 @@ export interface Device {
 
 export interface DeviceListResponse {
   devices: Device[];
+  stale?: boolean;
 }
 
 export interface ChatResponse {
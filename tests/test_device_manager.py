@@ -0,0 +1,135 @@
+"""Tests for DeviceManager polling."""
+
+from unittest import mock
+
+from AutoGLM_GUI.device_manager import DeviceManager, DeviceState
+from phone_agent.adb.connection import ConnectionType, DeviceInfo
+
+
+def _usb(device_id: str) -> DeviceInfo:
+    return DeviceInfo(
+        device_id=device_id,
+        status="device",
+        connection_type=ConnectionType.USB,
+        model="Pixel",
+    )
+
+
+def test_serial_lookup_only_for_new_device_ids(monkeypatch):
+    """Test that getprop runs once per connection, not once per poll."""
+    calls = []
+
+    def fake_get_device_serial(device_id, adb_path="adb"):
+        calls.append(device_id)
+        return f"SER-{device_id}"
+
+    monkeypatch.setattr(
+        "AutoGLM_GUI.adb_plus.serial.get_device_serial", fake_get_device_serial
+    )
+    dm = DeviceManager()
+    dm._enable_mdns_discovery = False
+    dm._adb_conn = mock.Mock()
+
+    dm._adb_conn.list_devices.return_value = [_usb("USB1")]
+    dm._poll_devices()
+    dm._poll_devices()
+    assert calls == ["USB1"]
+
+    dm._adb_conn.list_devices.return_value = [_usb("USB1"), _usb("USB2")]
+    dm._poll_devices()
+    assert calls == ["USB1", "USB2"]
+    assert [d.serial for d in dm.get_devices()] == ["SER-USB1", "SER-USB2"]
+
+    # A device_id that disconnects is looked up again when it comes back
+    dm._adb_conn.list_devices.return_value = [_usb("USB2")]
+    dm._poll_devices()
+    dm._adb_conn.list_devices.return_value = [_usb("USB1"), _usb("USB2")]
+    dm._poll_devices()
+    assert calls == ["USB1", "USB2", "USB1"]
+
+
+def test_failed_serial_lookup_backs_off_per_device(monkeypatch):
+    """Test that a failing device is retried on backoff, not every poll."""
+    calls = []
+
+    def fake_get_device_serial(device_id, adb_path="adb"):
+        calls.append(device_id)
+        return None if device_id == "BAD" else f"SER-{device_id}"
+
+    monkeypatch.setattr(
+        "AutoGLM_GUI.adb_plus.serial.get_device_serial", fake_get_device_serial
+    )
+    dm = DeviceManager()
+    dm._enable_mdns_discovery = False
+    dm._adb_conn = mock.Mock()
+
+    bad = _usb("BAD")
+    dm._adb_conn.list_devices.return_value = [_usb("USB1"), bad]
+    dm._poll_devices()
+    dm._poll_devices()
+    assert sorted(calls) == ["BAD", "USB1"]
+    assert [d.serial for d in dm.get_devices()] == ["SER-USB1"]
+
+    # A status change (e.g. the user accepted the RSA prompt) retries at once
+    bad.status = "unauthorized"
+    calls.clear()
+    dm._poll_devices()
+    assert calls == ["BAD"]
+
+
+def test_disconnected_device_dropped_after_grace_period(monkeypatch):
+    """Test that disconnected devices are kept for a while, then dropped."""
+    monkeypatch.setattr(
+        "AutoGLM_GUI.adb_plus.serial.get_device_serial",
+        lambda device_id, adb_path="adb": f"SER-{device_id}",
+    )
+    dm = DeviceManager()
+    dm._enable_mdns_discovery = False
+    dm._adb_conn = mock.Mock()
+
+    dm._adb_conn.list_devices.return_value = [_usb("USB1")]
+    dm._poll_devices()
+    dm._adb_conn.list_devices.return_value = []
+    dm._poll_devices()
+    dm._poll_devices()
+    (device,) = dm.get_devices()
+    assert device.state is DeviceState.DISCONNECTED
+
+    device.last_seen_mono -= 2 * 3600
+    dm._poll_devices()
+    assert dm.get_devices() == ()
+
+
+def test_poll_never_mutates_published_devices(monkeypatch):
+    """Test that readers holding a device never see it change under them."""
+    monkeypatch.setattr(
+        "AutoGLM_GUI.adb_plus.serial.get_device_serial",
+        lambda device_id, adb_path="adb": "SER",
+    )
+    dm = DeviceManager()
+    dm._enable_mdns_discovery = False
+    dm._adb_conn = mock.Mock()
+
+    wifi = DeviceInfo(
+        device_id="1.2.3.4:5555",
+        status="device",
+        connection_type=ConnectionType.REMOTE,
+        model="Pixel",
+    )
+    dm._adb_conn.list_devices.return_value = [wifi, _usb("USB1")]
+    dm._poll_devices()
+    (before,) = dm.get_devices()
+    assert before.primary_device_id == "USB1"
+
+    dm._adb_conn.list_devices.return_value = [wifi]
+    dm._poll_devices()
+    (after,) = dm.get_devices()
+    assert after is not before
+    assert after.primary_device_id == "1.2.3.4:5555"
+    assert [c.device_id for c in before.connections] == ["1.2.3.4:5555", "USB1"]
+    assert before.primary_device_id == "USB1"
+
+    dm._adb_conn.list_devices.return_value = []
+    dm._poll_devices()
+    assert after.state is DeviceState.ONLINE
+    assert dm.get_devices()[0].state is DeviceState.DISCONNECTED
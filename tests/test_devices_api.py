@@ -0,0 +1,119 @@
+"""Tests for /api/devices conditional GET (ETag / If-None-Match)."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from AutoGLM_GUI.api import create_app
+from AutoGLM_GUI.device_manager import DeviceManager
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create test client with ADB polling stubbed out."""
+    monkeypatch.setattr(DeviceManager, "force_refresh", lambda self: None)
+    app = create_app()
+    return TestClient(app)
+
+
+def test_list_devices_returns_etag(client):
+    response = client.get("/api/devices")
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "devices" in response.json()
+
+
+def test_list_devices_not_modified(client):
+    etag = client.get("/api/devices").headers["ETag"]
+
+    response = client.get("/api/devices", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    "header",
+    ['"other", {etag}', '{etag} , W/"other"', "*"],
+)
+def test_list_devices_not_modified_header_lists(client, header):
+    etag = client.get("/api/devices").headers["ETag"]
+
+    response = client.get(
+        "/api/devices", headers={"If-None-Match": header.format(etag=etag)}
+    )
+    assert response.status_code == 304
+
+
+def test_list_devices_etag_changes_with_stale(client, monkeypatch):
+    etag = client.get("/api/devices").headers["ETag"]
+
+    monkeypatch.setattr(DeviceManager, "is_polling", property(lambda self: True))
+    response = client.get("/api/devices", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "stale" not in response.json()
+
+
+def test_list_devices_etag_changes_with_version(client):
+    etag = client.get("/api/devices").headers["ETag"]
+
+    DeviceManager.get_instance()._version += 1
+
+    response = client.get("/api/devices", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_list_devices_stale_without_polling(client):
+    # TestClient without a context manager skips lifespan, so polling is off
+    response = client.get("/api/devices")
+    assert response.status_code == 200
+    assert response.json()["stale"] is True
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/api/devices/connect_wifi_manual", {"ip": "256.1.1.1"}),
+        ("/api/devices/connect_wifi_manual", {"ip": "192.168.1.2", "port": 0}),
+        (
+            "/api/devices/pair_wifi",
+            {"ip": "192.168.1.2", "pairing_port": 37000, "pairing_code": "12345"},
+        ),
+    ],
+)
+def test_wifi_requests_rejected_before_adb(client, monkeypatch, path, body):
+    def fail(*args, **kwargs):
+        raise AssertionError("adb should not be called for invalid input")
+
+    monkeypatch.setattr(DeviceManager, "connect_wifi_manual", fail)
+    monkeypatch.setattr(DeviceManager, "pair_wifi", fail)
+
+    response = client.post(path, json=body)
+    assert response.status_code == 422
+
+
+def test_schedule_refresh_runs_one_fallback_at_a_time(monkeypatch):
+    import asyncio
+    import threading
+
+    from AutoGLM_GUI.api import devices as devices_api
+
+    calls = []
+    release = threading.Event()
+
+    def slow_refresh(self):
+        calls.append(self)
+        release.wait(5)
+
+    monkeypatch.setattr(DeviceManager, "force_refresh", slow_refresh)
+    monkeypatch.setattr(DeviceManager, "request_refresh", lambda self: False)
+
+    async def scenario():
+        devices_api._schedule_refresh()
+        devices_api._schedule_refresh()
+        await asyncio.sleep(0.05)
+        release.set()
+        await devices_api._fallback_refresh
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
@@ -78,36 +78,50 @@ def test_metrics_no_errors(client):
     )
 
 
-def test_metrics_capture_failed_agents():
+def test_metrics_capture_failed_agents(monkeypatch):
     """Test that failed agent initialization is captured in metrics."""
-    from AutoGLM_GUI.phone_agent_manager import AgentState, PhoneAgentManager
+    import time
+    from types import SimpleNamespace
+
+    from phone_agent.agent import AgentConfig
+    from phone_agent.model import ModelConfig
+
+    from AutoGLM_GUI.device_manager import DeviceManager
+    from AutoGLM_GUI.exceptions import AgentInitializationError
+    from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
     from AutoGLM_GUI.metrics import get_metrics_registry
     from prometheus_client import generate_latest
 
     manager = PhoneAgentManager.get_instance()
-
-    # Simulate a failed agent initialization (state=ERROR, no metadata)
+    device_manager = DeviceManager.get_instance()
     test_device_id = "test_failed_device_123"
 
-    # Directly set state to ERROR without metadata (simulating failed init)
-    with manager._manager_lock:
-        manager._states[test_device_id] = AgentState.ERROR
-        # Explicitly ensure no metadata exists
-        manager._metadata.pop(test_device_id, None)
+    # The device is connected, but creating its agent fails
+    lookup = device_manager.get_device_by_device_id
+    monkeypatch.setattr(
+        device_manager,
+        "get_device_by_device_id",
+        lambda device_id: (
+            SimpleNamespace(serial="SER123")
+            if device_id == test_device_id
+            else lookup(device_id)
+        ),
+    )
+
+    def failing_agent(**kwargs):
+        raise RuntimeError("model unreachable")
+
+    monkeypatch.setattr("AutoGLM_GUI.phone_agent_manager.PhoneAgent", failing_agent)
+    before = time.time()
+    with pytest.raises(AgentInitializationError):
+        manager.initialize_agent(
+            test_device_id, ModelConfig(), AgentConfig(device_id=test_device_id)
+        )
 
     try:
-        # Collect metrics
         registry = get_metrics_registry()
         output = generate_latest(registry).decode("utf-8")
 
-        # Verify that the failed agent appears in metrics
-        assert "autoglm_agents_total" in output
-
-        # Verify that state="error" is reported for the test device
-        assert 'state="error"' in output
-
-        # Verify that the test device appears with error state
-        # (format: autoglm_agents_total{device_id="...",serial="...",state="error"} 1.0)
         lines_with_test_device = [
             line for line in output.split("\n") if test_device_id in line
         ]
@@ -117,24 +131,32 @@ def test_metrics_capture_failed_agents():
         error_state_line = [
             line
             for line in lines_with_test_device
-            if 'state="error"' in line and "1.0" in line
+            if 'state="error"' in line and line.endswith(" 1.0")
         ]
         assert len(error_state_line) > 0, (
             "Error state not correctly reported for failed agent"
         )
 
-        # Verify timestamps are 0 for failed agent (no metadata)
+        # Timestamps report the failure time, not the epoch
         timestamp_lines = [
-            line
-            for line in output.split("\n")
-            if test_device_id in line and "timestamp_seconds" in line
+            line for line in lines_with_test_device if "timestamp_seconds" in line
         ]
+        assert len(timestamp_lines) == 2
         for line in timestamp_lines:
-            if test_device_id in line:
-                # Should report 0.0 for failed agents
-                assert "0.0" in line, f"Non-zero timestamp for failed agent: {line}"
+            assert float(line.rsplit(" ", 1)[1]) >= int(before)
+
+        # Scraping is read-only, even after the device is gone
+        monkeypatch.setattr(device_manager, "get_device_by_device_id", lookup)
+        version = manager.version
+        generate_latest(registry)
+        assert manager.version == version
+        assert manager.get_metadata(test_device_id) is not None
+
+        # The next agent lifecycle change drops the stale failure record
+        manager.destroy_agent("test_unrelated_device")
+        assert manager.get_metadata(test_device_id) is None
+        assert test_device_id not in generate_latest(registry).decode("utf-8")
 
     finally:
-        # Cleanup: remove test state
         with manager._manager_lock:
-            manager._states.pop(test_device_id, None)
+            manager._metadata.pop(test_device_id, None)
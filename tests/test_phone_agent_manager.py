@@ -0,0 +1,101 @@
+"""Tests for PhoneAgentManager lifecycle."""
+
+import threading
+
+from AutoGLM_GUI.phone_agent_manager import PhoneAgentManager
+from AutoGLM_GUI.state import agents
+from phone_agent.agent import AgentConfig
+from phone_agent.model import ModelConfig
+
+
+def test_reset_agent_reuses_instance_with_unchanged_config():
+    """Test that reset clears the conversation without rebuilding the agent."""
+    manager = PhoneAgentManager()
+    device_id = "test_reset_device"
+    agent = manager.initialize_agent(
+        device_id,
+        ModelConfig(base_url="http://localhost:1/v1", api_key="test"),
+        AgentConfig(device_id=device_id),
+    )
+    try:
+        agent._context.append({"role": "user", "content": "hi"})
+        agent._step_count = 3
+
+        manager.reset_agent(device_id)
+
+        assert agents[device_id] is agent
+        assert agent._context == []
+        assert agent._step_count == 0
+    finally:
+        manager.destroy_agent(device_id)
+
+
+def test_reset_agent_rebuilds_while_device_is_busy():
+    """Test that a reset during a running task leaves that task's agent alone."""
+    manager = PhoneAgentManager()
+    device_id = "test_reset_busy_device"
+    agent = manager.initialize_agent(
+        device_id,
+        ModelConfig(base_url="http://localhost:1/v1", api_key="test"),
+        AgentConfig(device_id=device_id),
+    )
+    try:
+        agent._context.append({"role": "system", "content": "prompt"})
+        agent._step_count = 3
+
+        with manager.use_agent(device_id) as running:
+            manager.reset_agent(device_id)
+
+            assert running is agent
+            assert agents[device_id] is not agent
+            assert agent._context == [{"role": "system", "content": "prompt"}]
+            assert agent._step_count == 3
+    finally:
+        manager.destroy_agent(device_id)
+
+
+def test_destroy_agent_drops_unheld_device_lock():
+    """Test that destroying an agent does not leak its device lock."""
+    manager = PhoneAgentManager()
+    device_id = "test_destroy_device"
+    manager.initialize_agent(
+        device_id,
+        ModelConfig(base_url="http://localhost:1/v1", api_key="test"),
+        AgentConfig(device_id=device_id),
+    )
+    manager.acquire_device(device_id)
+    manager.release_device(device_id)
+    assert device_id in manager._device_locks
+
+    manager.destroy_agent(device_id)
+    assert device_id not in manager._device_locks
+
+
+def test_acquire_retries_when_lock_was_dropped(monkeypatch):
+    """Test that a lock dropped by destroy_agent is never used for exclusion."""
+    manager = PhoneAgentManager()
+    device_id = "test_stale_lock_device"
+    manager.initialize_agent(
+        device_id,
+        ModelConfig(base_url="http://localhost:1/v1", api_key="test"),
+        AgentConfig(device_id=device_id),
+    )
+    try:
+        # First lookup hands out a lock that is no longer in the map, as if
+        # destroy_agent + initialize_agent ran between fetch and acquire
+        stale = threading.Lock()
+        lookups = iter([stale])
+        get_lock = manager._get_device_lock
+        monkeypatch.setattr(
+            manager, "_get_device_lock", lambda d: next(lookups, None) or get_lock(d)
+        )
+
+        manager.acquire_device(device_id)
+        current = manager._device_locks[device_id]
+        assert current.locked()
+        assert not stale.locked()
+
+        manager.release_device(device_id)
+        assert not current.locked()
+    finally:
+        manager.destroy_agent(device_id)
@@ -1,6 +1,10 @@
 """Unit tests for mDNS serial extraction."""
 
-from AutoGLM_GUI.adb_plus.serial import extract_serial_from_mdns, get_device_serial
+from AutoGLM_GUI.adb_plus.serial import (
+    extract_serial_from_mdns,
+    get_device_serial,
+    get_device_serials,
+)
 
 
 class TestMdnsSerialExtraction:
@@ -137,3 +141,66 @@ class TestGetDeviceSerialIntegration:
         serial = get_device_serial(device_id)
         # Extraction fails, getprop attempted (fails in test env)
         assert serial is None
+
+
+class TestGetDeviceSerials:
+    """Test batch serial lookup via get_device_serials()."""
+
+    def test_mdns_devices_skip_adb(self, monkeypatch):
+        """Test that mDNS device IDs never spawn adb."""
+        calls = []
+        monkeypatch.setattr(
+            "AutoGLM_GUI.adb_plus.serial.get_device_serial",
+            lambda device_id, adb_path="adb": calls.append(device_id),
+        )
+        serials = get_device_serials(
+            ["adb-AAAAAA._adb-tls-connect._tcp", "adb-BBBBBB._adb._tcp"]
+        )
+        assert serials == {
+            "adb-AAAAAA._adb-tls-connect._tcp": "AAAAAA",
+            "adb-BBBBBB._adb._tcp": "BBBBBB",
+        }
+        assert calls == []
+
+    def test_mixed_devices(self, monkeypatch):
+        """Test that non-mDNS devices are resolved via get_device_serial."""
+        lookup = {"192.168.1.100:5555": "SER1", "USB123": "USB123", "bad": None}
+        monkeypatch.setattr(
+            "AutoGLM_GUI.adb_plus.serial.get_device_serial",
+            lambda device_id, adb_path="adb": lookup[device_id],
+        )
+        serials = get_device_serials(
+            ["192.168.1.100:5555", "adb-CCCCCC._adb._tcp", "USB123", "bad"]
+        )
+        assert serials == {
+            "192.168.1.100:5555": "SER1",
+            "adb-CCCCCC._adb._tcp": "CCCCCC",
+            "USB123": "USB123",
+            "bad": None,
+        }
+
+    def test_empty_input(self):
+        """Test that an empty device list returns an empty mapping."""
+        assert get_device_serials([]) == {}
+
+    def test_cache_skips_adb_for_known_devices(self, monkeypatch):
+        """Test that cached device IDs are not looked up again."""
+        calls = []
+
+        def fake_get_device_serial(device_id, adb_path="adb"):
+            calls.append(device_id)
+            return {"USB1": "SER1", "USB2": None}[device_id]
+
+        monkeypatch.setattr(
+            "AutoGLM_GUI.adb_plus.serial.get_device_serial", fake_get_device_serial
+        )
+        cache: dict[str, str] = {}
+        assert get_device_serials(["USB1", "USB2"], cache=cache) == {
+            "USB1": "SER1",
+            "USB2": None,
+        }
+        assert cache == {"USB1": "SER1"}
+
+        calls.clear()
+        get_device_serials(["USB1", "USB2"], cache=cache)
+        assert calls == ["USB2"]
@@ -0,0 +1,64 @@
+"""Tests for the Socket.IO video stream sessions."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+import AutoGLM_GUI.socketio_server as sio_server
+
+
+class _FakeStreamer:
+    """ScrcpyStreamer stand-in whose start() waits for the test to release it."""
+
+    gate: asyncio.Event
+
+    def __init__(self, device_id, max_size, bit_rate):
+        self.device_id = device_id
+        self.stopped = False
+
+    async def start(self):
+        await _FakeStreamer.gate.wait()
+
+    async def read_video_metadata(self):
+        return SimpleNamespace(device_name="d", width=1, height=1, codec="h264")
+
+    async def iter_packets(self):
+        await asyncio.Event().wait()
+        yield
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_queued_connect_after_disconnect_does_not_attach(monkeypatch):
+    """Test that a connect-device queued behind a disconnect is dropped."""
+    monkeypatch.setattr(sio_server, "ScrcpyStreamer", _FakeStreamer)
+    monkeypatch.setattr(sio_server.sio, "emit", mock.AsyncMock())
+
+    async def scenario():
+        _FakeStreamer.gate = asyncio.Event()
+        _FakeStreamer.gate.set()
+        # Another client already watches device "shared"
+        await sio_server.connect_device("watcher", {"device_id": "shared"})
+        shared = sio_server._streams[("shared", 1280, 4_000_000)]
+
+        # Client "gone" starts a slow cold start, then queues a second
+        # connect-device for the shared stream behind it, and disconnects
+        _FakeStreamer.gate = asyncio.Event()
+        first = asyncio.create_task(
+            sio_server.connect_device("gone", {"device_id": "slow"})
+        )
+        await asyncio.sleep(0)
+        second = asyncio.create_task(
+            sio_server.connect_device("gone", {"device_id": "shared"})
+        )
+        await asyncio.sleep(0)
+        await sio_server.disconnect("gone")
+        _FakeStreamer.gate.set()
+        await asyncio.gather(first, second)
+
+        assert "gone" not in sio_server._sessions
+        assert "gone" not in shared.subscribers | shared._pending
+        await sio_server.stop_streamers()
+
+    asyncio.run(scenario())